@@ -0,0 +1,356 @@
+"""
+End-to-end benchmarks for repository discovery, log collection, prompt
+building, generation and history writes, run against synthetic repositories
+and a stub LLM. Run from the project root:
+
+    python -m benchmarks.run_benchmarks --repos 20 --commits 200 --output bench.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.stub_llm import StubLLM
+from benchmarks.synthetic_repos import generate_repos
+
+
+def measure(fn: Callable[[], object], repeat: int = 3) -> Dict[str, float]:
+    """Run fn repeat times and return min/median/max wall time in seconds"""
+    durations = []
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - started)
+    return {
+        "runs": len(durations),
+        "min": round(min(durations), 6),
+        "median": round(statistics.median(durations), 6),
+        "max": round(max(durations), 6),
+    }
+
+
+def configure_environment(workdir: str, repos_root: str) -> None:
+    """Point every data file at the benchmark directory; must run before main is imported"""
+    os.environ.update({
+        "REPO_PATHS": repos_root,
+        "REPO_INDEX_FILE": os.path.join(workdir, "repo_index.json"),
+        "COMMIT_STORE_FILE": os.path.join(workdir, "commits.db"),
+        "GIT_CHANGE_STATE_FILE": os.path.join(workdir, "repo_changes.json"),
+        "SUMMARY_CACHE_FILE": os.path.join(workdir, "summary_cache.db"),
+        "AUTHOR_ALIASES_FILE": os.path.join(workdir, "author_aliases.json"),
+        "EOD_SCHEDULE": "",
+        "OLLAMA_WARMUP": "false",
+    })
+
+
+def history_service_class(db_file: str):
+    from history_components.history_service import HistoryService
+    return type("BenchHistoryService", (HistoryService,), {"HISTORY_DB": db_file})
+
+
+def bench_repo_discovery(fetcher, repeat: int) -> Dict:
+    return {
+        "repos": len(fetcher.get_git_repo_paths(refresh=True)),
+        "cold_scan": measure(lambda: fetcher.get_git_repo_paths(refresh=True), repeat),
+        "cached_index": measure(lambda: fetcher.get_git_repo_paths(), repeat),
+    }
+
+
+def count_git_processes(fn: Callable[[], object], workdir: str) -> int:
+    """Run fn once with git's trace2 event log enabled and count the git processes it started"""
+    trace_file = os.path.join(workdir, "git-trace2.json")
+    if os.path.exists(trace_file):
+        os.remove(trace_file)
+    os.environ["GIT_TRACE2_EVENT"] = trace_file
+    try:
+        fn()
+    finally:
+        del os.environ["GIT_TRACE2_EVENT"]
+    if not os.path.exists(trace_file):
+        return 0
+    with open(trace_file) as f:
+        return sum('"event":"start"' in line for line in f)
+
+
+def bench_log_backends(fetcher, workdir: str, days: int, repeat: int) -> Dict:
+    """
+    Compare the git log backends on the same repositories, with their process
+    counts, and the commit store (the default path) on a fresh and a synced database.
+    """
+    from git_components.commit_store import CommitStore
+    from git_components.git_service import LOG_BACKENDS
+
+    store, backend = fetcher.commit_store, fetcher.log_backend
+    fetcher.commit_store = None
+    results = {
+        "fork_git_version": measure(
+            lambda: subprocess.run(["git", "--version"], capture_output=True), max(repeat, 10)
+        ),
+    }
+    try:
+        for name, backend_class in LOG_BACKENDS.items():
+            fetcher.log_backend = backend_class()
+            results[name] = {
+                "logs": measure(lambda: fetcher.get_git_logs(days=days), repeat),
+                "records": measure(lambda: fetcher.get_commit_records(days=days), repeat),
+                "logs_git_processes": count_git_processes(lambda: fetcher.get_git_logs(days=days), workdir),
+                "records_git_processes": count_git_processes(
+                    lambda: fetcher.get_commit_records(days=days), workdir
+                ),
+            }
+        if store is not None:
+            fetcher.log_backend = backend
+            fetcher.commit_store = CommitStore(
+                os.path.join(workdir, "commits-backends.db"), horizon_days=store.horizon_days
+            )
+            results["commit_store"] = {
+                "cold_records_git_processes": count_git_processes(
+                    lambda: fetcher.get_commit_records(days=days), workdir
+                ),
+                "records": measure(lambda: fetcher.get_commit_records(days=days), repeat),
+                "records_git_processes": count_git_processes(
+                    lambda: fetcher.get_commit_records(days=days), workdir
+                ),
+                "logs_git_processes": count_git_processes(lambda: fetcher.get_git_logs(days=days), workdir),
+            }
+    finally:
+        fetcher.commit_store, fetcher.log_backend = store, backend
+    return results
+
+
+def bench_log_collection(fetcher, workdir: str, days: int, repeat: int) -> Dict:
+    from git_components.commit_store import CommitStore
+
+    store = fetcher.commit_store
+    results = {}
+    if store is not None:
+        cold_runs = []
+
+        def cold_sync():
+            fetcher.commit_store = CommitStore(
+                os.path.join(workdir, f"commits-cold-{len(cold_runs)}.db"),
+                horizon_days=store.horizon_days
+            )
+            cold_runs.append(fetcher.get_commit_records(days=days))
+
+        results["store_cold"] = measure(cold_sync, repeat)
+        results["store_warm"] = measure(lambda: fetcher.get_commit_records(days=days), repeat)
+        results["store_all_authors"] = measure(
+            lambda: fetcher.get_commit_records(days=days, all_authors=True), repeat
+        )
+        fetcher.commit_store = None
+    try:
+        results["live_records"] = measure(lambda: fetcher.get_commit_records(days=days), repeat)
+        results["text_logs"] = measure(lambda: fetcher.get_git_logs(days=days), repeat)
+    finally:
+        fetcher.commit_store = store
+    collection = fetcher.get_commit_records(days=days)
+    results["commits"] = len(collection.records)
+    results["errors"] = len(collection.errors)
+    return results
+
+
+def bench_change_tracking(fetcher, repeat: int) -> Dict:
+    """Collection over a date range without commits, querying every repository vs. skipping unchanged ones"""
+    tracker = fetcher.change_tracker
+    query = lambda: fetcher.get_commit_records_by_date_range("2000-01-01", "2000-01-07")
+    fetcher.change_tracker = None
+    try:
+        results = {"untracked": measure(query, repeat)}
+    finally:
+        fetcher.change_tracker = tracker
+    if tracker is not None:
+        query()
+        results["unchanged"] = measure(query, repeat)
+        results["skipped_repos"] = len(query().skipped)
+    return results
+
+
+def bench_prompt_building(records, token_budget: int, repeat: int) -> Dict:
+    from llm_components.prompt_builder import build_commit_prompt
+
+    prompt = build_commit_prompt(records, token_budget)
+    return {
+        "commits": len(records),
+        "original_tokens": prompt.original_tokens,
+        "prompt_tokens": prompt.tokens,
+        "build": measure(lambda: build_commit_prompt(records, token_budget), repeat),
+    }
+
+
+def run_request(client, path: str, payload: Optional[Dict] = None) -> Dict:
+    """Run one generation request to completion, noting when the response starts"""
+    started = time.perf_counter()
+    response = client.post(path, json=payload)
+    first_response_at = None
+    body = []
+    for chunk in response.response:
+        text = chunk.decode() if isinstance(chunk, bytes) else chunk
+        if first_response_at is None and "RESPONSE_START" in text:
+            first_response_at = time.perf_counter() - started
+        body.append(text)
+    total = time.perf_counter() - started
+    output = "".join(body)
+    return {
+        "status": response.status_code,
+        "seconds": round(total, 6),
+        "response_start_seconds": round(first_response_at, 6) if first_response_at is not None else None,
+        "error": "Error:" in output,
+    }
+
+
+def bench_generation(app_main, stub: StubLLM, start_date: str, end_date: str) -> Dict:
+    client = app_main.app.test_client()
+    results = {
+        "stub_generate": measure(lambda: stub.generate(collected_commits=""), 1),
+        "eod_streaming": run_request(client, "/run-eod?cache=0&stream=1"),
+        "eod_blocking": run_request(client, "/run-eod?cache=0&stream=0"),
+        "eod_batch": run_request(client, "/run-eod-batch?cache=0"),
+    }
+    for mode in ("single", "ticket", "hierarchical"):
+        results[f"sprint_review_{mode}"] = run_request(
+            client,
+            "/run-sprint-review?cache=0&stream=0",
+            {"startDate": start_date, "endDate": end_date, "tickets": ["BENCH-1", "BENCH-2"], "mode": mode}
+        )
+    results["llm_calls"] = stub.calls
+    return results
+
+
+def bench_history(workdir: str, sizes: List[int], repeat: int) -> Dict:
+    from history_components.history_service import HistoryEntry
+
+    results = {}
+    response = "- Summary line for the benchmark entry\n" * 20
+    for size in sizes:
+        db_file = os.path.join(workdir, f"history-{size}.db")
+        service = history_service_class(db_file)()
+        started = time.perf_counter()
+        for offset in range(0, size, 5000):
+            service.add_entries([
+                HistoryEntry(entry_type="EOD", response=response, status="passed")
+                for _ in range(min(5000, size - offset))
+            ])
+        prefill = time.perf_counter() - started
+        entries, _ = service.list_entries(limit=1)
+        entry_id = entries[0]["id"] if entries else None
+        results[str(size)] = {
+            "prefill_seconds": round(prefill, 6),
+            "add_entry": measure(
+                lambda: service.add_entry(HistoryEntry(entry_type="EOD", response=response, status="passed")),
+                repeat
+            ),
+            "list_first_page": measure(lambda: service.list_entries(limit=50, include_response=False), repeat),
+            "get_entry_by_id": measure(lambda: service.get_entry_by_id(entry_id), repeat),
+            "get_revision": measure(service.get_revision, repeat),
+            "load_all": measure(service.load_history, 1),
+            "db_bytes": os.path.getsize(db_file),
+        }
+    return results
+
+
+def compare(current: Dict, previous: Dict, threshold: float, path: str = "") -> List[str]:
+    """List measurements whose median grew by more than threshold (e.g. 0.2 = 20%)"""
+    regressions = []
+    for key, value in current.items():
+        old = previous.get(key) if isinstance(previous, dict) else None
+        name = f"{path}.{key}" if path else key
+        if isinstance(value, dict) and "median" in value and isinstance(old, dict) and old.get("median"):
+            if value["median"] > old["median"] * (1 + threshold):
+                regressions.append(f"{name}: {old['median']:.4f}s -> {value['median']:.4f}s")
+        elif isinstance(value, dict) and isinstance(old, dict):
+            regressions.extend(compare(value, old, threshold, name))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the EOD and sprint review pipelines")
+    parser.add_argument("--repos", type=int, default=10, help="number of synthetic repositories")
+    parser.add_argument("--commits", type=int, default=100, help="commits per repository")
+    parser.add_argument("--branches", type=int, default=2, help="feature branches per repository")
+    parser.add_argument("--days", type=int, default=1, help="days the commits are spread over")
+    parser.add_argument("--llm-ttft", type=float, default=0.2, help="stub LLM seconds to first token")
+    parser.add_argument("--llm-tokens-per-second", type=float, default=200.0, help="stub LLM output rate")
+    parser.add_argument("--llm-output-tokens", type=int, default=200, help="stub LLM tokens per response")
+    parser.add_argument("--history-sizes", default="10,1000,100000", help="comma separated history sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement")
+    parser.add_argument("--workdir", help="directory for repositories and databases (default: a temp dir)")
+    parser.add_argument("--keep", action="store_true", help="keep the working directory afterwards")
+    parser.add_argument("--output", default="benchmark_results.json", help="where to write the JSON results")
+    parser.add_argument("--compare", help="previous results file to check for regressions")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown before reporting")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING)
+    workdir = os.path.abspath(args.workdir or tempfile.mkdtemp(prefix="eod-bench-"))
+    repos_root = os.path.join(workdir, "repos")
+    os.makedirs(workdir, exist_ok=True)
+
+    results: Dict = {
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "git": subprocess.run(["git", "--version"], capture_output=True, text=True).stdout.strip(),
+        },
+        "stages": {},
+    }
+    try:
+        started = time.perf_counter()
+        generate_repos(repos_root, args.repos, args.commits, args.branches, args.days)
+        results["setup_seconds"] = round(time.perf_counter() - started, 6)
+
+        configure_environment(workdir, repos_root)
+        import main as app_main
+        app_main.history_service = history_service_class(os.path.join(workdir, "history-e2e.db"))()
+        stub = StubLLM(args.llm_ttft, args.llm_tokens_per_second, args.llm_output_tokens)
+        stub.install(app_main)
+        logging.getLogger().setLevel(logging.WARNING)
+
+        fetcher = app_main.git_log_fetcher
+        stages = results["stages"]
+        stages["repo_discovery"] = bench_repo_discovery(fetcher, args.repeat)
+        stages["log_collection"] = bench_log_collection(fetcher, workdir, args.days, args.repeat)
+        stages["log_backends"] = bench_log_backends(fetcher, workdir, args.days, args.repeat)
+        stages["change_tracking"] = bench_change_tracking(fetcher, args.repeat)
+        records = fetcher.get_commit_records(days=args.days).records
+        stages["prompt_building"] = bench_prompt_building(records, app_main.PROMPT_TOKEN_BUDGET, args.repeat)
+        today = time.strftime("%Y-%m-%d")
+        start_date = time.strftime("%Y-%m-%d", time.localtime(time.time() - args.days * 86400))
+        stages["generation"] = bench_generation(app_main, stub, start_date, today)
+        stages["history"] = bench_history(
+            workdir, [int(size) for size in args.history_sizes.split(",") if size.strip()], args.repeat
+        )
+        app_main.job_service.shutdown(wait=True)
+    finally:
+        if not args.keep and not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote benchmark results to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        regressions = compare(results["stages"], previous.get("stages", {}), args.threshold)
+        for line in regressions:
+            print(f"Regression: {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
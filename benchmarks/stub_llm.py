@@ -0,0 +1,39 @@
+import time
+from typing import Iterator
+
+
+class StubLLM:
+    """
+    Stands in for Ollama: waits `ttft` seconds before the first token and then
+    emits `output_tokens` tokens at `tokens_per_second`. Generators and
+    streamers have the same signatures as the ones in llm_connector.
+    """
+
+    def __init__(self, ttft: float = 0.2, tokens_per_second: float = 50.0, output_tokens: int = 200):
+        self.ttft = ttft
+        self.tokens_per_second = tokens_per_second
+        self.output_tokens = output_tokens
+        self.calls = 0
+
+    def stream(self, **inputs) -> Iterator[str]:
+        self.calls += 1
+        time.sleep(self.ttft)
+        delay = 1 / self.tokens_per_second if self.tokens_per_second > 0 else 0
+        for index in range(self.output_tokens):
+            if delay:
+                time.sleep(delay)
+            yield f"tok{index} " if index % 20 else f"\n- item{index} "
+
+    def generate(self, **inputs) -> str:
+        return "".join(self.stream(**inputs))
+
+    def install(self, module) -> None:
+        """Replace the LLM entry points imported into module (normally main)"""
+        for name in (
+            "llm_eod_summary_generator",
+            "llm_repo_day_summary_generator",
+            "llm_sprint_review_summary_generator",
+        ):
+            setattr(module, name, self.generate)
+        for name in ("llm_eod_summary_stream", "llm_sprint_review_summary_stream"):
+            setattr(module, name, self.stream)
@@ -0,0 +1,95 @@
+import os
+import random
+import subprocess
+import time
+from typing import List
+
+BENCH_AUTHOR = "Bench User"
+BENCH_EMAIL = "bench@example.com"
+OTHER_AUTHORS = [
+    ("Alex Rivera", "alex@example.com"),
+    ("Sam Chen", "sam@example.com"),
+]
+SUBJECTS = [
+    "feat({scope}): add {thing} for {ticket}",
+    "fix({scope}): handle empty {thing}",
+    "refactor({scope}): split {thing} helpers",
+    "chore: bump {thing} version",
+    "docs({scope}): describe {thing} usage",
+]
+SCOPES = ["api", "ui", "db", "auth", "build"]
+THINGS = ["pagination", "cache", "session", "retry", "export", "parser"]
+
+
+def _commit_block(ref: str, mark: int, parent: int, author, timestamp: int, message: str, path: str, content: str) -> str:
+    name, email = author
+    lines = [
+        f"commit {ref}",
+        f"mark :{mark}",
+        f"author {name} <{email}> {timestamp} +0000",
+        f"committer {name} <{email}> {timestamp} +0000",
+        f"data {len(message.encode())}",
+        message,
+    ]
+    if parent:
+        lines.append(f"from :{parent}")
+    lines += [f"M 644 inline {path}", f"data {len(content.encode())}", content, ""]
+    return "\n".join(lines)
+
+
+def generate_repo(repo_path: str, commits: int, branches: int, days: float, seed: int) -> None:
+    """
+    Create one repository with `commits` commits spread over the last `days` days.
+    Most commits belong to BENCH_AUTHOR (the repository's user.name); the rest
+    come from OTHER_AUTHORS. Commits are split between main and feature
+    branches forked from it. Uses a single `git fast-import` for speed.
+    """
+    rng = random.Random(seed)
+    subprocess.run(["git", "init", "-q", "-b", "main", repo_path], check=True)
+    subprocess.run(["git", "-C", repo_path, "config", "user.name", BENCH_AUTHOR], check=True)
+    subprocess.run(["git", "-C", repo_path, "config", "user.email", BENCH_EMAIL], check=True)
+
+    now = int(time.time()) - 60
+    span = max(1, int(days * 86400) - 120)
+    timestamps = sorted(now - rng.randrange(span) for _ in range(commits))
+    branch_names = ["main"] + [f"feature/BENCH-{seed * 100 + i}" for i in range(branches)]
+    main_commits = max(1, commits // (branches + 1))
+
+    blocks: List[str] = []
+    mark = 0
+    tips = {}
+    for index, timestamp in enumerate(timestamps):
+        branch = "main" if index < main_commits else branch_names[1 + index % max(1, branches)]
+        parent = tips.get(branch) or tips.get("main", 0)
+        author = (BENCH_AUTHOR, BENCH_EMAIL) if rng.random() < 0.7 else rng.choice(OTHER_AUTHORS)
+        subject = rng.choice(SUBJECTS).format(
+            scope=rng.choice(SCOPES),
+            thing=rng.choice(THINGS),
+            ticket=f"BENCH-{rng.randrange(1, 50)}",
+        )
+        body = "\n".join(f"- detail {line} of change {index}" for line in range(rng.randrange(0, 4)))
+        message = f"{subject}\n\n{body}\n" if body else f"{subject}\n"
+        mark += 1
+        blocks.append(_commit_block(
+            f"refs/heads/{branch}", mark, parent, author, timestamp, message,
+            f"src/module_{index % 20}.txt", f"change {index}\n"
+        ))
+        tips[branch] = mark
+
+    subprocess.run(
+        ["git", "-C", repo_path, "fast-import", "--quiet"],
+        input="\n".join(blocks).encode(),
+        check=True
+    )
+    subprocess.run(["git", "-C", repo_path, "checkout", "-q", "main"], check=True)
+
+
+def generate_repos(root_path: str, repos: int, commits: int, branches: int = 2, days: float = 1) -> List[str]:
+    """Create `repos` synthetic repositories under root_path and return their paths"""
+    os.makedirs(root_path, exist_ok=True)
+    paths = []
+    for index in range(repos):
+        repo_path = os.path.join(root_path, f"repo-{index:04d}")
+        generate_repo(repo_path, commits, branches, days, seed=index + 1)
+        paths.append(repo_path)
+    return paths
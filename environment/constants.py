@@ -4,3 +4,54 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 root_path = os.getenv("REPO_PATHS")
+
+# Maximum number of repositories whose git logs are collected concurrently
+git_log_workers = int(os.getenv("GIT_LOG_WORKERS", "8"))
+
+# Repository discovery settings
+repo_index_file = os.getenv("REPO_INDEX_FILE", "data/.repo_index.json")
+scan_nested_repos = os.getenv("GIT_SCAN_NESTED_REPOS", "false").lower() in ("1", "true", "yes")
+scan_ignore_dirs = [
+    name.strip()
+    for name in os.getenv(
+        "GIT_SCAN_IGNORE_DIRS",
+        "node_modules,.venv,venv,env,__pycache__,.tox,.nox,.mypy_cache,.pytest_cache,.idea,.gradle,target"
+    ).split(",")
+    if name.strip()
+]
+
+# Incremental commit store settings
+commit_store_enabled = os.getenv("COMMIT_STORE_ENABLED", "true").lower() in ("1", "true", "yes")
+commit_store_file = os.getenv("COMMIT_STORE_FILE", "data/.commits.db")
+commit_store_horizon_days = int(os.getenv("COMMIT_STORE_HORIZON_DAYS", "120"))
+
+# Background generation job settings
+job_workers = int(os.getenv("JOB_WORKERS", "2"))
+job_queue_depth = int(os.getenv("JOB_QUEUE_DEPTH", "16"))
+job_retention_minutes = float(os.getenv("JOB_RETENTION_MINUTES", "60"))
+
+# Web server settings
+server_mode = os.getenv("SERVER_MODE", "production").lower()
+server_host = os.getenv("SERVER_HOST", "127.0.0.1")
+server_port = int(os.getenv("SERVER_PORT", "5001"))
+server_threads = int(os.getenv("SERVER_THREADS", "16"))
+server_connection_limit = int(os.getenv("SERVER_CONNECTION_LIMIT", "100"))
+server_channel_timeout = int(os.getenv("SERVER_CHANNEL_TIMEOUT", "120"))
+server_drain_seconds = float(os.getenv("SERVER_DRAIN_SECONDS", "60"))
+
+# Scheduled EOD pre-generation: comma separated local times such as "17:30,17:45" (empty disables it)
+eod_schedule = [value.strip() for value in os.getenv("EOD_SCHEDULE", "").split(",") if value.strip()]
+eod_precompute_max_age_minutes = float(os.getenv("EOD_PRECOMPUTE_MAX_AGE_MINUTES", "30"))
+
+# JSON object mapping alternative author emails to a canonical email for batch EODs
+author_aliases_file = os.getenv("AUTHOR_ALIASES_FILE", "data/author_aliases.json")
+
+# How live git logs are read: "single-pass" runs one `git log` per repository,
+# "shell" runs the original connector scripts (one git process per branch)
+git_log_backend = os.getenv("GIT_LOG_BACKEND", "single-pass").lower()
+
+# Change tracking: skip git queries for repositories whose refs did not change since they last showed no commits
+change_tracking_enabled = os.getenv("GIT_CHANGE_TRACKING", "true").lower() in ("1", "true", "yes")
+change_state_file = os.getenv("GIT_CHANGE_STATE_FILE", "data/.repo_changes.json")
+# Keep the change state live with inotify while the server runs (Linux only)
+watch_repos = os.getenv("GIT_WATCH_REPOS", "false").lower() in ("1", "true", "yes")
@@ -0,0 +1,33 @@
+import json
+import logging
+from typing import Dict, Iterable, List
+from git_components.commit_records import CommitRecord
+
+
+def load_author_aliases(path: str) -> Dict[str, str]:
+    """
+    Load a JSON object mapping alias emails to canonical emails, e.g.
+    {"jane@old-domain.com": "jane@example.com"}. A missing file means no aliases.
+    """
+    try:
+        with open(path, 'r') as f:
+            aliases = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, json.JSONDecodeError) as e:
+        logging.warning(f"Ignoring unreadable author aliases file {path}: {e}")
+        return {}
+    return {alias.strip().lower(): canonical.strip().lower() for alias, canonical in aliases.items()}
+
+
+def canonical_author(email: str, aliases: Dict[str, str]) -> str:
+    email = email.strip().lower()
+    return aliases.get(email, email)
+
+
+def partition_by_author(records: Iterable[CommitRecord], aliases: Dict[str, str]) -> Dict[str, List[CommitRecord]]:
+    """Group commit records by canonical author email, sorted by email"""
+    partitions: Dict[str, List[CommitRecord]] = {}
+    for record in records:
+        partitions.setdefault(canonical_author(record.email, aliases), []).append(record)
+    return dict(sorted(partitions.items()))
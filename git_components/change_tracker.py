@@ -0,0 +1,355 @@
+import ctypes
+import ctypes.util
+import json
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+from git_components.git_config import (
+    CONFIG_ENVIRONMENT,
+    UnsupportedConfig,
+    common_git_dir,
+    global_config_files,
+    worktree_git_dir,
+)
+
+# Files whose size and mtime are part of a repository's state, relative to the
+# worktree git directory (HEAD, its reflog) or the common git directory (the rest)
+WORKTREE_FILES = ("HEAD", "logs/HEAD")
+COMMON_FILES = ("packed-refs", "config", "reftable/tables.list")
+
+
+def _file_stat(path: str) -> Optional[List[int]]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _loose_branch_tips(common_dir: str) -> Dict[str, str]:
+    """Branch name -> contents of its loose ref file under refs/heads"""
+    heads_dir = os.path.join(common_dir, "refs", "heads")
+    tips = {}
+    for dirpath, _, filenames in os.walk(heads_dir):
+        for filename in filenames:
+            if filename.endswith(".lock"):
+                continue
+            path = os.path.join(dirpath, filename)
+            with open(path, "r") as f:
+                tips[os.path.relpath(path, heads_dir).replace(os.sep, "/")] = f.read().strip()
+    return tips
+
+
+def read_branch_tips(repo_path: str) -> Optional[Dict[str, str]]:
+    """
+    Branch name -> commit hash from the loose refs and packed-refs, without
+    running git. Returns None for repositories this reader does not handle
+    (reftable, symbolic branch refs), where `git for-each-ref` is needed instead.
+    """
+    try:
+        common_dir = common_git_dir(worktree_git_dir(repo_path))
+        if os.path.isdir(os.path.join(common_dir, "reftable")):
+            return None
+        tips = {}
+        try:
+            with open(os.path.join(common_dir, "packed-refs"), "r") as f:
+                for line in f:
+                    sha, _, ref = line.strip().partition(" ")
+                    if ref.startswith("refs/heads/") and not sha.startswith(("#", "^")):
+                        tips[ref[len("refs/heads/"):]] = sha
+        except FileNotFoundError:
+            pass
+        tips.update(_loose_branch_tips(common_dir))
+    except (OSError, UnsupportedConfig) as e:
+        logging.debug(f"Cannot read the branch tips of {repo_path}: {e}")
+        return None
+    if any(tip.startswith("ref:") for tip in tips.values()):
+        return None
+    return tips
+
+
+def repo_state(repo_path: str) -> Optional[Dict]:
+    """
+    Snapshot what decides a repository's log output without running git: the
+    branch tips stored as loose refs plus the size and mtime of HEAD, logs/HEAD,
+    packed-refs, the repository config and the reftable table list.
+    Returns None when the repository cannot be read this way.
+    """
+    try:
+        git_dir = worktree_git_dir(repo_path)
+        common_dir = common_git_dir(git_dir)
+        tips = _loose_branch_tips(common_dir)
+        files = {}
+        for base_dir, names in ((git_dir, WORKTREE_FILES), (common_dir, COMMON_FILES)):
+            for name in names:
+                stat = _file_stat(os.path.join(base_dir, name))
+                if stat is not None:
+                    files[name] = stat
+    except (OSError, UnsupportedConfig) as e:
+        logging.debug(f"Cannot snapshot {repo_path}: {e}")
+        return None
+    return {"tips": tips, "files": files}
+
+
+def global_config_state() -> List:
+    """Stats of the system and user git config files and the environment variables that override them"""
+    return [
+        [path, _file_stat(path)] for path in global_config_files()
+    ] + [
+        [variable, os.environ.get(variable)] for variable in CONFIG_ENVIRONMENT
+    ]
+
+
+def window_covers(window: List, since: float, until: Optional[float]) -> bool:
+    """Whether a query window [since, until] lies inside a window known to have no commits"""
+    quiet_since, quiet_until = window
+    if since < quiet_since:
+        return False
+    return quiet_until is None or (until is not None and until <= quiet_until)
+
+
+class RepoWatcher:
+    """
+    Marks repositories dirty when inotify reports a change to their HEAD,
+    reflog, branch refs, packed-refs or config. Linux only; clean repositories
+    can reuse their last snapshot instead of being stat'ed again.
+    """
+    IN_MODIFY = 0x2
+    IN_ATTRIB = 0x4
+    IN_CLOSE_WRITE = 0x8
+    IN_MOVED_FROM = 0x40
+    IN_MOVED_TO = 0x80
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_DELETE_SELF = 0x400
+    IN_MOVE_SELF = 0x800
+    IN_Q_OVERFLOW = 0x4000
+    IN_IGNORED = 0x8000
+    IN_ONLYDIR = 0x1000000
+    IN_CLOEXEC = 0x80000
+    IN_NONBLOCK = 0x800
+    WATCH_MASK = (
+        IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+        | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+    )
+    EVENT_HEADER = struct.Struct("iIII")
+
+    def __init__(self):
+        self._libc = None
+        self._fd: Optional[int] = None
+        self._lock = threading.Lock()
+        # watch descriptor -> (repository, names that matter in that directory or None for any)
+        self._watches: Dict[int, Tuple[str, Optional[Set[str]]]] = {}
+        self._watched: Set[str] = set()
+        self._dirty: Set[str] = set()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._failed = False
+
+    def _start(self) -> bool:
+        if self._fd is not None:
+            return True
+        if self._failed:
+            return False
+        try:
+            if not sys.platform.startswith("linux"):
+                raise OSError("inotify is only available on Linux")
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+            if fd < 0:
+                raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+        except (OSError, AttributeError) as e:
+            logging.warning(f"Repository watcher unavailable, falling back to stat checks: {e}")
+            self._failed = True
+            return False
+        self._libc, self._fd = libc, fd
+        self._thread = threading.Thread(target=self._loop, name="repo-watcher", daemon=True)
+        self._thread.start()
+        logging.info("Repository watcher started")
+        return True
+
+    def _add_watch(self, path: str, repo_path: str, names: Optional[Set[str]]) -> bool:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), self.WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            if errno != 2:  # ENOENT: the directory does not exist (yet)
+                logging.warning(f"Cannot watch {path}: {os.strerror(errno)}")
+                return False
+            return True
+        self._watches[wd] = (repo_path, names)
+        return True
+
+    def watch(self, repo_path: str) -> bool:
+        """
+        Watch a repository's git directories (again, to pick up new ref directories).
+        Returns False when the repository could not be watched completely.
+        """
+        with self._lock:
+            if not self._start():
+                return False
+            try:
+                git_dir = worktree_git_dir(repo_path)
+                common_dir = common_git_dir(git_dir)
+            except (OSError, UnsupportedConfig):
+                self._watched.discard(repo_path)
+                return False
+            directories = [
+                (git_dir, {"HEAD", "logs"}),
+                (os.path.join(git_dir, "logs"), {"HEAD"}),
+                (common_dir, {"packed-refs", "config", "refs", "reftable"}),
+                (os.path.join(common_dir, "refs"), {"heads"}),
+                (os.path.join(common_dir, "reftable"), None),
+            ]
+            for dirpath, _, _ in os.walk(os.path.join(common_dir, "refs", "heads")):
+                directories.append((dirpath, None))
+            complete = all([self._add_watch(path, repo_path, names) for path, names in directories])
+            if complete:
+                self._watched.add(repo_path)
+            else:
+                self._watched.discard(repo_path)
+            return complete
+
+    def is_clean(self, repo_path: str) -> bool:
+        """Nothing changed since the last mark_checked, as far as inotify knows"""
+        with self._lock:
+            return repo_path in self._watched and repo_path not in self._dirty
+
+    def mark_checked(self, repo_path: str) -> None:
+        with self._lock:
+            self._dirty.discard(repo_path)
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            readable, _, _ = select.select([self._fd], [], [], 1.0)
+            if not readable:
+                continue
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            with self._lock:
+                self._handle_events(data)
+
+    def _handle_events(self, data: bytes) -> None:
+        offset = 0
+        while offset + self.EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            name = data[offset + self.EVENT_HEADER.size:offset + self.EVENT_HEADER.size + length]
+            name = os.fsdecode(name.rstrip(b"\0"))
+            offset += self.EVENT_HEADER.size + length
+            if mask & self.IN_Q_OVERFLOW:
+                # Events were lost, so any repository may have changed
+                self._dirty.update(self._watched)
+                continue
+            watch = self._watches.get(wd)
+            if watch is None:
+                continue
+            repo_path, names = watch
+            if mask & self.IN_IGNORED:
+                # The directory is gone; the repository is re-watched at its next check
+                del self._watches[wd]
+                self._watched.discard(repo_path)
+            if names is None or not name or name in names:
+                self._dirty.add(repo_path)
+
+
+class ChangeTracker:
+    """
+    Remembers, per repository, the state it was last queried in (see repo_state)
+    and the query windows that returned no commits. A later query is answered
+    with "no activity" without running git when the repository's state and the
+    global git config are unchanged and its window lies inside a quiet window:
+    no new commits means none can appear in a window that only slid forward.
+    The state is saved to state_file between runs.
+    """
+
+    def __init__(self, state_file: str, watch: bool = False):
+        self.state_file = state_file
+        self.watcher: Optional[RepoWatcher] = RepoWatcher() if watch else None
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict]] = None
+        # Last snapshot per repository, reused while the watcher reports it clean
+        self._snapshots: Dict[str, Optional[Dict]] = {}
+        self._changed = False
+
+    def _load(self) -> Dict[str, Dict]:
+        if self._entries is None:
+            try:
+                with open(self.state_file, "r") as f:
+                    self._entries = json.load(f).get("repos", {})
+            except FileNotFoundError:
+                self._entries = {}
+            except (OSError, json.JSONDecodeError, AttributeError) as e:
+                logging.warning(f"Ignoring unreadable repository change state {self.state_file}: {e}")
+                self._entries = {}
+        return self._entries
+
+    def state(self, repo_path: str) -> Optional[Dict]:
+        """The repository's current state, reusing the last snapshot while the watcher saw no change"""
+        if self.watcher is None:
+            return repo_state(repo_path)
+        if self.watcher.is_clean(repo_path) and repo_path in self._snapshots:
+            return self._snapshots[repo_path]
+        self.watcher.watch(repo_path)
+        # Cleared before the snapshot so a change made while it is taken marks the repository again
+        self.watcher.mark_checked(repo_path)
+        state = self._snapshots[repo_path] = repo_state(repo_path)
+        return state
+
+    def is_quiet(self, repo_path: str, scope: str, state: Optional[Dict], since: float, until: Optional[float]) -> bool:
+        """Whether a query over [since, until] is known to return no commits for repo_path"""
+        if state is None:
+            return False
+        with self._lock:
+            entry = self._load().get(repo_path)
+            if entry is None or entry["state"] != state or entry["config"] != global_config_state():
+                return False
+            window = entry["quiet"].get(scope)
+            return window is not None and window_covers(window, since, until)
+
+    def record(
+        self,
+        repo_path: str,
+        scope: str,
+        state: Optional[Dict],
+        since: float,
+        until: Optional[float],
+        empty: bool
+    ) -> None:
+        """Remember the state a query ran against and whether it found any commits"""
+        with self._lock:
+            entries = self._load()
+            if state is None:
+                self._changed = entries.pop(repo_path, None) is not None or self._changed
+                return
+            config = global_config_state()
+            entry = entries.get(repo_path)
+            if entry is None or entry["state"] != state or entry["config"] != config:
+                entry = entries[repo_path] = {"state": state, "config": config, "quiet": {}}
+                self._changed = True
+            if empty:
+                entry["quiet"][scope] = [since, until]
+                self._changed = True
+            elif entry["quiet"].pop(scope, None) is not None:
+                self._changed = True
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._changed or self._entries is None:
+                return
+            try:
+                os.makedirs(os.path.dirname(self.state_file) or ".", exist_ok=True)
+                tmp_file = f"{self.state_file}.tmp"
+                with open(tmp_file, "w") as f:
+                    json.dump({"repos": self._entries}, f)
+                os.replace(tmp_file, self.state_file)
+                self._changed = False
+            except OSError as e:
+                logging.warning(f"Could not save repository change state {self.state_file}: {e}")
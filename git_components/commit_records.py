@@ -0,0 +1,122 @@
+import re
+from typing import Dict, Iterable, List, Optional
+
+# Conventional commit subject: type(scope)!: description
+CONVENTIONAL_SUBJECT = re.compile(r"^(?P<type>[A-Za-z]+)(?:\((?P<scope>[^)]*)\))?!?:\s*")
+
+DEFAULT_BRANCHES = ("main", "master", "develop", "development", "trunk")
+
+
+def extract_scope(subject: str) -> str:
+    """Return the scope of a conventional commit subject, or its type when no scope is given"""
+    match = CONVENTIONAL_SUBJECT.match(subject)
+    if not match:
+        return ""
+    return (match.group("scope") or match.group("type")).strip()
+
+
+class CommitRecord:
+    """A single commit as seen on one branch of one repository"""
+    __slots__ = ("sha", "repo", "branch", "author", "email", "date", "subject", "scope", "body", "is_merge")
+
+    def __init__(
+        self,
+        sha: str,
+        repo: str,
+        branch: str,
+        author: str,
+        email: str,
+        date: str,
+        subject: str,
+        scope: Optional[str] = None,
+        body: str = "",
+        is_merge: bool = False
+    ):
+        self.sha = sha
+        self.repo = repo
+        self.branch = branch
+        self.author = author
+        self.email = email
+        self.date = date
+        self.subject = subject
+        self.scope = extract_scope(subject) if scope is None else scope
+        self.body = body
+        self.is_merge = is_merge
+
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"CommitRecord({self.repo}@{self.branch} {self.sha[:7]} {self.subject!r})"
+
+
+class CommitCollection:
+    """
+    Commit records collected across repositories plus per-repository errors and
+    timings, and the repositories skipped because change tracking showed no new commits
+    """
+    __slots__ = ("records", "errors", "timings", "skipped")
+
+    def __init__(
+        self,
+        records: List[CommitRecord],
+        errors: Optional[Dict[str, str]] = None,
+        timings: Optional[Dict[str, float]] = None,
+        skipped: Optional[List[str]] = None
+    ):
+        self.records = records
+        self.errors = errors or {}
+        self.timings = timings or {}
+        self.skipped = skipped or []
+
+
+def deduplicate(records: Iterable[CommitRecord]) -> List[CommitRecord]:
+    """
+    Keep one record per commit SHA, so a commit reached through several
+    clones, worktrees or branches is reported once. A feature branch is
+    preferred over a default branch because it says more about the work.
+    """
+    unique: Dict[str, CommitRecord] = {}
+    for record in records:
+        kept = unique.get(record.sha)
+        if kept is None:
+            unique[record.sha] = record
+        elif kept.branch in DEFAULT_BRANCHES and record.branch not in DEFAULT_BRANCHES:
+            unique[record.sha] = record
+    return list(unique.values())
+
+
+def group_commits(records: Iterable[CommitRecord]) -> Dict[str, Dict[str, Dict[str, List[CommitRecord]]]]:
+    """Group records by date (newest first), then repository, then branch"""
+    grouped: Dict[str, Dict[str, Dict[str, List[CommitRecord]]]] = {}
+    for record in sorted(records, key=lambda r: r.date, reverse=True):
+        grouped.setdefault(record.date, {}).setdefault(record.repo, {}).setdefault(record.branch, []).append(record)
+    return grouped
+
+
+def truncate_body(body: str, limit: int) -> str:
+    """Collapse a commit body onto one line and cut it to limit characters"""
+    body = " ".join(body.split())
+    return body if len(body) <= limit else body[:max(0, limit - 3)].rstrip() + "..."
+
+
+def format_commits(records: Iterable[CommitRecord], body_limits: Optional[Dict[str, int]] = None) -> str:
+    """
+    Render records as a compact, pre-grouped text block for the LLM prompt.
+    body_limits maps a commit SHA to the number of body characters to include;
+    commits without an entry are rendered with their subject only.
+    """
+    body_limits = body_limits or {}
+    lines = []
+    for date, repos in group_commits(records).items():
+        lines.append(f"Date: {date}")
+        for repo, branches in repos.items():
+            lines.append(f"  Repository: {repo}")
+            for branch, branch_records in branches.items():
+                lines.append(f"    Branch: {branch}")
+                for record in branch_records:
+                    lines.append(f"      - {record.subject}")
+                    limit = body_limits.get(record.sha, 0)
+                    if limit and record.body:
+                        lines.append(f"        {truncate_body(record.body, limit)}")
+    return "\n".join(lines) if lines else "No commits found."
@@ -0,0 +1,387 @@
+import heapq
+import json
+import logging
+import os
+import sqlite3
+import subprocess
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+from git_components.change_tracker import read_branch_tips, repo_state
+from git_components.commit_records import CommitRecord
+from git_components.git_config import author_pattern, read_user_name, run_git
+
+# One record per commit: fields separated by NUL, records terminated by RS
+LOG_FORMAT = "%H%x00%an%x00%ae%x00%ad%x00%ct%x00%P%x00%s%x00%b%x1e"
+LOG_FIELDS = 8
+
+# LOG_FORMAT plus the abbreviated hash and the branch tips pointing at each commit
+SINGLE_PASS_FORMAT = "%H%x00%h%x00%D%x00%an%x00%ae%x00%ad%x00%ct%x00%P%x00%s%x00%b%x1e"
+SINGLE_PASS_FIELDS = 10
+
+# Bump when the tables change; the store is a cache and is rebuilt on mismatch
+SCHEMA_VERSION = 4
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS repos (
+    repo_path TEXT PRIMARY KEY,
+    author_name TEXT,
+    state TEXT,
+    synced_at REAL
+);
+CREATE TABLE IF NOT EXISTS ref_tips (
+    repo_path TEXT NOT NULL,
+    branch TEXT NOT NULL,
+    sha TEXT NOT NULL,
+    PRIMARY KEY (repo_path, branch)
+);
+CREATE TABLE IF NOT EXISTS commits (
+    repo_path TEXT NOT NULL,
+    sha TEXT NOT NULL,
+    author_name TEXT,
+    author_email TEXT,
+    author_date TEXT,
+    commit_time INTEGER,
+    parent_count INTEGER,
+    subject TEXT,
+    body TEXT,
+    parents TEXT,
+    PRIMARY KEY (repo_path, sha)
+);
+CREATE TABLE IF NOT EXISTS branch_commits (
+    repo_path TEXT NOT NULL,
+    branch TEXT NOT NULL,
+    sha TEXT NOT NULL,
+    commit_time INTEGER,
+    PRIMARY KEY (repo_path, branch, sha)
+);
+CREATE INDEX IF NOT EXISTS idx_branch_commits_time ON branch_commits (repo_path, commit_time);
+"""
+
+
+def parse_log_output(output: str) -> List[Tuple]:
+    """Parse `git log --format=LOG_FORMAT` output into commit tuples"""
+    commits = []
+    for record in output.split("\x1e"):
+        record = record.strip("\n")
+        if not record:
+            continue
+        fields = record.split("\x00")
+        if len(fields) != LOG_FIELDS:
+            logging.warning(f"Skipping malformed git log record: {record[:80]!r}")
+            continue
+        sha, author_name, author_email, author_date, commit_time, parents, subject, body = fields
+        commits.append((
+            sha, author_name, author_email, author_date, int(commit_time),
+            len(parents.split()), subject, body.strip()
+        ))
+    return commits
+
+
+def walk_by_date(tip: str, commits: Dict[str, Tuple], parents: Dict[str, List[str]]) -> List[str]:
+    """
+    Hashes reachable from tip in the order `git log <tip>` lists them: newest
+    commit date first, ties in the order they were reached. The walk stops at
+    commits missing from commits, like git's walk stops at commits before --since.
+    """
+    queue = [(-commits[tip][4], 0, tip)]
+    seen = {tip}
+    walked = []
+    while queue:
+        _, _, sha = heapq.heappop(queue)
+        walked.append(sha)
+        for parent in parents[sha]:
+            if parent in commits and parent not in seen:
+                seen.add(parent)
+                heapq.heappush(queue, (-commits[parent][4], len(seen), parent))
+    return walked
+
+
+def read_commit_graph(
+    repo_path: str,
+    since: float,
+    revisions: Sequence[str] = ("--branches",)
+) -> Tuple[Dict[str, Tuple], Dict[str, List[str]], Dict[str, str], Dict[str, str]]:
+    """
+    Read the commits since a unix time reachable from revisions (every branch
+    by default) with one `git log`. Returns commit tuples (as parse_log_output
+    builds them), parent hashes and abbreviated hashes by commit hash, and the
+    tip of every branch pointing at one of those commits.
+    """
+    log = run_git(
+        repo_path, "log", *revisions, f"--since=@{int(since)}",
+        "--decorate-refs=refs/heads/", "--decorate=full",
+        f"--format={SINGLE_PASS_FORMAT}", "--date=short", "--"
+    )
+    commits: Dict[str, Tuple] = {}
+    parents: Dict[str, List[str]] = {}
+    short_shas: Dict[str, str] = {}
+    tips: Dict[str, str] = {}
+    for record in log.stdout.split("\x1e"):
+        record = record.strip("\n")
+        if not record:
+            continue
+        fields = record.split("\x00")
+        if len(fields) != SINGLE_PASS_FIELDS:
+            logging.warning(f"Skipping malformed git log record: {record[:80]!r}")
+            continue
+        sha, short_sha, refs, author, email, date, commit_time, parent_shas, subject, body = fields
+        commits[sha] = (
+            sha, author, email, date, int(commit_time), len(parent_shas.split()), subject, body.strip()
+        )
+        parents[sha] = parent_shas.split()
+        short_shas[sha] = short_sha
+        for ref in refs.split(", "):
+            ref = ref.removeprefix("HEAD -> ")
+            if ref.startswith("refs/heads/"):
+                tips[ref[len("refs/heads/"):]] = sha
+    return commits, parents, short_shas, tips
+
+
+def commit_to_record(repo_name: str, branch: str, commit: Tuple) -> CommitRecord:
+    """Build a CommitRecord from a tuple produced by parse_log_output"""
+    sha, name, email, date, _, parent_count, subject, body = commit
+    return CommitRecord(sha, repo_name, branch, name, email, date, subject, body=body, is_merge=parent_count > 1)
+
+
+class CommitStore:
+    """
+    SQLite cache of commits per repository and branch.
+
+    Each sync first compares the repository's refs and config files with the
+    previous sync (see repo_state) and runs no git process while they are
+    unchanged. Otherwise a single `git log` fetches only the commits added
+    since the branch tips recorded on the previous sync, and the branches whose
+    tips moved are re-indexed from the stored commit graph plus those commits.
+    When a recorded tip is no longer an ancestor of its branch (a rewrite or
+    force-push), or the refs cannot be read without git, every branch is re-read
+    up to the configured horizon instead.
+    """
+
+    def __init__(self, db_file: str, horizon_days: int = 120):
+        self.db_file = db_file
+        self.horizon_days = horizon_days
+        self._repo_locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+        # The database is created (or rebuilt after a schema change) on first use
+        self._ready = False
+        self._ready_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._ready:
+            with self._ready_lock:
+                if not self._ready:
+                    self._create_schema()
+                    self._ready = True
+        return self._open()
+
+    def _create_schema(self) -> None:
+        os.makedirs(os.path.dirname(self.db_file) or ".", exist_ok=True)
+        with self._open() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                for table in ("repos", "ref_tips", "commits", "branch_commits"):
+                    conn.execute(f"DROP TABLE IF EXISTS {table}")
+            conn.executescript(SCHEMA)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_file, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def horizon_start(self) -> float:
+        """Unix time of the oldest commit the store is guaranteed to hold"""
+        return time.time() - self.horizon_days * 86400
+
+    def covers(self, since: float) -> bool:
+        """Whether a query starting at since can be answered from the store"""
+        return since >= self.horizon_start()
+
+    def _repo_lock(self, repo_path: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._repo_locks.setdefault(repo_path, threading.Lock())
+
+    def sync_repo(self, repo_path: str) -> int:
+        """
+        Bring the store up to date with the branch tips of repo_path.
+        Concurrent syncs of the same repository are serialized so the work is done once.
+        Returns the number of newly indexed commits.
+        """
+        with self._repo_lock(repo_path):
+            return self._sync_repo(repo_path)
+
+    def _read_new_commits(
+        self,
+        repo_path: str,
+        known_tips: Dict[str, str],
+        current_tips: Dict[str, str]
+    ) -> Optional[Tuple[Dict[str, Tuple], Dict[str, List[str]]]]:
+        """
+        The stored commit graph within the horizon plus the commits reachable from
+        the moved branch tips but from none of the recorded ones, read with one
+        `git log`. Returns None when a moved branch no longer contains its recorded
+        tip, or a recorded tip is gone, so the caller re-reads every branch.
+        """
+        moved = {branch: tip for branch, tip in current_tips.items() if known_tips.get(branch) != tip}
+        if not moved:
+            return {}, {}
+        excluded = sorted({known_tips[branch] for branch in current_tips if branch in known_tips})
+        try:
+            commits, parents, _, _ = read_commit_graph(
+                repo_path, self.horizon_start(), [*sorted(set(moved.values())), "--not", *excluded]
+            )
+        except subprocess.CalledProcessError as e:
+            logging.info(f"Re-reading {repo_path}: {(e.stderr or str(e)).strip()}")
+            return None
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                """
+                SELECT sha, author_name, author_email, author_date, commit_time, parent_count, subject, body, parents
+                FROM commits WHERE repo_path = ? AND commit_time >= ?
+                """,
+                (repo_path, int(self.horizon_start()))
+            ).fetchall()
+        for *commit, parent_shas in rows:
+            if commit[0] not in commits:
+                commits[commit[0]] = tuple(commit)
+                parents[commit[0]] = parent_shas.split()
+
+        for branch, tip in moved.items():
+            old_tip = known_tips.get(branch)
+            if old_tip is not None and (tip not in commits or old_tip not in walk_by_date(tip, commits, parents)):
+                logging.info(f"Branch {branch} of {repo_path} was rewritten, re-reading every branch")
+                return None
+        return commits, parents
+
+    def _sync_repo(self, repo_path: str) -> int:
+        # Taken before git runs, so refs that move while it does are seen as a change next time
+        state = repo_state(repo_path)
+        state_key = json.dumps(state, sort_keys=True) if state is not None else None
+        author_name = read_user_name(repo_path)
+
+        with self._connect() as conn:
+            row = conn.execute("SELECT state FROM repos WHERE repo_path = ?", (repo_path,)).fetchone()
+            if state_key is not None and row is not None and row[0] == state_key:
+                conn.execute(
+                    "UPDATE repos SET author_name = ?, synced_at = ? WHERE repo_path = ?",
+                    (author_name, time.time(), repo_path)
+                )
+                return 0
+            known_tips = dict(conn.execute(
+                "SELECT branch, sha FROM ref_tips WHERE repo_path = ?", (repo_path,)
+            ).fetchall())
+
+        current_tips = read_branch_tips(repo_path)
+        graph = self._read_new_commits(repo_path, known_tips, current_tips) if current_tips is not None else None
+        if graph is None:
+            commits, parents, _, decorated_tips = read_commit_graph(repo_path, self.horizon_start())
+            # The refs read from disk also list the branches without commits inside the horizon
+            current_tips = current_tips if current_tips is not None else decorated_tips
+        else:
+            commits, parents = graph
+
+        new_commits = 0
+        with self._connect() as conn:
+            for branch, tip in current_tips.items():
+                if known_tips.get(branch) == tip:
+                    continue
+                # A tip older than the horizon leaves the branch without commits to index
+                branch_commits = [commits[sha] for sha in walk_by_date(tip, commits, parents)] if tip in commits else []
+                new_commits += conn.executemany(
+                    "INSERT OR IGNORE INTO commits VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [(repo_path, *commit, " ".join(parents[commit[0]])) for commit in branch_commits]
+                ).rowcount
+                conn.execute(
+                    "DELETE FROM branch_commits WHERE repo_path = ? AND branch = ?", (repo_path, branch)
+                )
+                conn.executemany(
+                    "INSERT INTO branch_commits VALUES (?, ?, ?, ?)",
+                    [(repo_path, branch, commit[0], commit[4]) for commit in branch_commits]
+                )
+                conn.execute("INSERT OR REPLACE INTO ref_tips VALUES (?, ?, ?)", (repo_path, branch, tip))
+
+            # Deleted branches, and branches without commits inside the horizon when the refs could not be read
+            for branch in set(known_tips) - set(current_tips):
+                conn.execute(
+                    "DELETE FROM branch_commits WHERE repo_path = ? AND branch = ?", (repo_path, branch)
+                )
+                conn.execute("DELETE FROM ref_tips WHERE repo_path = ? AND branch = ?", (repo_path, branch))
+            conn.execute(
+                "INSERT OR REPLACE INTO repos VALUES (?, ?, ?, ?)", (repo_path, author_name, state_key, time.time())
+            )
+
+        if new_commits:
+            logging.info(f"Indexed {new_commits} new commit(s) for {repo_path}")
+        return new_commits
+
+    def get_commits(
+        self,
+        repo_path: str,
+        since: float,
+        until: Optional[float] = None,
+        all_authors: bool = False
+    ) -> Dict[str, List[Tuple]]:
+        """
+        Return the repository owner's commits per branch committed between since and until,
+        or every author's commits when all_authors is set.
+        Branches are sorted by name and commits are newest first, as `git log` would list them.
+        """
+        until = until if until is not None else time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT author_name FROM repos WHERE repo_path = ?", (repo_path,)).fetchone()
+            author_name = row[0] if row else ""
+            rows = conn.execute(
+                """
+                SELECT bc.branch, c.sha, c.author_name, c.author_email, c.author_date, c.commit_time,
+                       c.parent_count, c.subject, c.body
+                FROM branch_commits bc
+                JOIN commits c ON c.repo_path = bc.repo_path AND c.sha = bc.sha
+                WHERE bc.repo_path = ? AND bc.commit_time >= ? AND bc.commit_time <= ?
+                ORDER BY bc.branch, c.commit_time DESC, c.rowid
+                """,
+                (repo_path, int(since), int(until))
+            ).fetchall()
+
+        author_regex = author_pattern(author_name) if author_name and not all_authors else None
+        commits_by_branch: Dict[str, List[Tuple]] = {}
+        for branch, *commit in rows:
+            name, email = commit[1], commit[2]
+            if author_regex is not None and not author_regex.search(f"{name} <{email}>"):
+                continue
+            commits_by_branch.setdefault(branch, []).append(tuple(commit))
+        return commits_by_branch
+
+    def get_records(
+        self,
+        repo_path: str,
+        since: float,
+        until: Optional[float] = None,
+        all_authors: bool = False
+    ) -> List[CommitRecord]:
+        """Return cached commits as CommitRecord objects"""
+        repo_name = os.path.basename(os.path.normpath(repo_path))
+        return [
+            commit_to_record(repo_name, branch, commit)
+            for branch, commits in self.get_commits(repo_path, since, until, all_authors).items()
+            for commit in commits
+        ]
+
+    def render_logs(self, repo_path: str, since: float, until: Optional[float] = None) -> str:
+        """Render cached commits in the same layout as the git connector scripts"""
+        lines = [f"=== Project: {os.path.basename(os.path.normpath(repo_path))} ==="]
+        for branch, commits in self.get_commits(repo_path, since, until).items():
+            lines.append(f"===== Branch: {branch} =====")
+            lines.extend(f"{commit[3]} {commit[0][:7]} {commit[6]}" for commit in commits)
+            lines.append("")
+        return "\n".join(lines).strip()
+
+
+def date_range_bounds(start_date: str, end_date: str) -> Tuple[float, float]:
+    """Return unix bounds covering start_date 00:00 to the end of end_date in local time"""
+    start = datetime.strptime(start_date, "%Y-%m-%d")
+    end = datetime.strptime(end_date, "%Y-%m-%d") + timedelta(days=1)
+    return start.timestamp(), end.timestamp() - 1
@@ -0,0 +1,188 @@
+import os
+import re
+import subprocess
+from functools import lru_cache
+from typing import List, Optional
+
+# Environment variables that change which config files git reads; fall back to git itself when set
+CONFIG_ENVIRONMENT = (
+    "GIT_DIR", "GIT_CONFIG", "GIT_CONFIG_GLOBAL", "GIT_CONFIG_SYSTEM", "GIT_CONFIG_COUNT", "GIT_CONFIG_PARAMETERS"
+)
+
+SECTION_PATTERN = re.compile(r'^\[\s*([A-Za-z0-9.-]+)\s*(?:"((?:[^"\\]|\\.)*)")?\s*\]\s*(.*)$')
+
+
+def run_git(repo_path: str, *args: str, check: bool = True) -> subprocess.CompletedProcess:
+    """Run a git command against repo_path and return the completed process"""
+    return subprocess.run(
+        ["git", "-C", repo_path, *args],
+        check=check,
+        capture_output=True,
+        text=True
+    )
+
+
+class UnsupportedConfig(Exception):
+    """The config uses a feature this reader does not implement, such as includes"""
+
+
+def _parse_value(raw: str) -> str:
+    """Unquote a config value and drop a trailing comment"""
+    value, quoted, index = [], False, 0
+    while index < len(raw):
+        char = raw[index]
+        if char == "\\" and index + 1 < len(raw):
+            value.append({"n": "\n", "t": "\t", "b": "\b"}.get(raw[index + 1], raw[index + 1]))
+            index += 2
+            continue
+        if char == '"':
+            quoted = not quoted
+        elif char in "#;" and not quoted:
+            break
+        else:
+            value.append(char)
+        index += 1
+    return "".join(value).strip()
+
+
+@lru_cache(maxsize=256)
+def _read_user_name(path: str, mtime_ns: int) -> Optional[str]:
+    """The last user.name set in one config file (cached until the file changes)"""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        lines = f.read().splitlines()
+    section, name = None, None
+    for line in lines:
+        line = line.strip()
+        if not line or line[0] in "#;":
+            continue
+        if line.endswith("\\"):
+            raise UnsupportedConfig(f"line continuation in {path}")
+        if line.startswith("["):
+            match = SECTION_PATTERN.match(line)
+            if not match:
+                raise UnsupportedConfig(f"unrecognized section in {path}: {line}")
+            section = (match.group(1).lower(), match.group(2))
+            if section[0] in ("include", "includeif"):
+                raise UnsupportedConfig(f"includes in {path}")
+            line = match.group(3).strip()
+            if not line:
+                continue
+        key, _, raw = line.partition("=")
+        if section == ("user", None) and key.strip().lower() == "name":
+            name = _parse_value(raw)
+    return name
+
+
+def worktree_git_dir(repo_path: str) -> str:
+    """The git directory of repo_path's working tree (holds HEAD and logs/HEAD)"""
+    git_dir = os.path.join(repo_path, ".git")
+    if os.path.isfile(git_dir):
+        # Worktrees and submodules point at their git directory from a .git file
+        with open(git_dir, "r") as f:
+            content = f.read().strip()
+        if not content.startswith("gitdir:"):
+            raise UnsupportedConfig(f"unrecognized .git file in {repo_path}")
+        git_dir = os.path.normpath(os.path.join(repo_path, content[len("gitdir:"):].strip()))
+    return git_dir
+
+
+def common_git_dir(git_dir: str) -> str:
+    """The git directory shared by all worktrees (holds config, refs and packed-refs)"""
+    common_dir_file = os.path.join(git_dir, "commondir")
+    if os.path.exists(common_dir_file):
+        with open(common_dir_file, "r") as f:
+            git_dir = os.path.normpath(os.path.join(git_dir, f.read().strip()))
+    return git_dir
+
+
+def global_config_files() -> List[str]:
+    """System and user config files git reads for every repository, lowest precedence first"""
+    home = os.path.expanduser("~")
+    xdg = os.environ.get("XDG_CONFIG_HOME") or os.path.join(home, ".config")
+    files = []
+    if not os.environ.get("GIT_CONFIG_NOSYSTEM"):
+        files.append("/etc/gitconfig")
+    files += [os.path.join(xdg, "git", "config"), os.path.join(home, ".gitconfig")]
+    return files
+
+
+def config_files(repo_path: str) -> List[str]:
+    """Config files git reads for repo_path, lowest precedence first"""
+    files = global_config_files()
+    git_dir = common_git_dir(worktree_git_dir(repo_path))
+    if os.path.exists(os.path.join(git_dir, "config.worktree")):
+        raise UnsupportedConfig(f"per-worktree config in {git_dir}")
+    files.append(os.path.join(git_dir, "config"))
+    return files
+
+
+def read_user_name(repo_path: str) -> str:
+    """
+    Return the user.name git would use in repo_path, read from the config files
+    directly so collecting logs does not need a `git config` process per repository.
+    Falls back to `git config user.name` for configs this reader does not handle.
+    """
+    if not any(os.environ.get(variable) for variable in CONFIG_ENVIRONMENT):
+        try:
+            name = None
+            for path in config_files(repo_path):
+                try:
+                    mtime_ns = os.stat(path).st_mtime_ns
+                except OSError:
+                    continue
+                name = _read_user_name(path, mtime_ns) or name
+            return name or ""
+        except (UnsupportedConfig, OSError):
+            pass
+    return run_git(repo_path, "config", "user.name", check=False).stdout.strip()
+
+
+def author_pattern(author_name: str) -> re.Pattern:
+    """
+    Compile author_name the way `git log --author` does: as a POSIX basic
+    regular expression, where ( ) { } | + ? match themselves and only their
+    backslashed forms are operators, and ^ and $ anchor only at the ends.
+    Falls back to matching author_name literally when it does not compile.
+    """
+    pattern, index = [], 0
+    while index < len(author_name):
+        char = author_name[index]
+        if char == "\\" and index + 1 < len(author_name):
+            escaped = author_name[index + 1]
+            if escaped in "(){}|+?":
+                pattern.append(escaped)
+            elif escaped in "<>":
+                pattern.append(r"\b")
+            elif escaped.isdigit() or escaped in "wWsSbB":
+                pattern.append(char + escaped)
+            else:
+                pattern.append(re.escape(escaped))
+            index += 2
+            continue
+        if char == "[":
+            end = index + 1
+            if author_name[end:end + 1] == "^":
+                end += 1
+            if author_name[end:end + 1] == "]":
+                end += 1
+            end = author_name.find("]", end)
+            if end != -1:
+                # Backslashes and brackets are plain characters inside a bracket expression
+                members = author_name[index + 1:end]
+                negate = "^" if members.startswith("^") else ""
+                members = members[len(negate):]
+                members = members.replace("\\", "\\\\").replace("[", "\\[").replace("]", "\\]")
+                pattern.append(f"[{negate}{members}]")
+                index = end + 1
+                continue
+        if char in "(){}|+?[" or (char == "^" and index > 0) or (char == "$" and index < len(author_name) - 1):
+            pattern.append(re.escape(char))
+        elif char == "*" and (index == 0 or author_name[:index] == "^"):
+            pattern.append(r"\*")
+        else:
+            pattern.append(char)
+        index += 1
+    try:
+        return re.compile("".join(pattern))
+    except re.error:
+        return re.compile(re.escape(author_name))
@@ -1,48 +1,366 @@
 import os
 import subprocess
 import logging
-from environment.constants import root_path
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from environment.constants import (
+    root_path,
+    change_state_file,
+    change_tracking_enabled,
+    git_log_backend,
+    git_log_workers,
+    repo_index_file,
+    scan_ignore_dirs,
+    scan_nested_repos,
+    watch_repos,
+    commit_store_enabled,
+    commit_store_file,
+    commit_store_horizon_days,
+)
+from git_components.commit_records import CommitCollection, CommitRecord, deduplicate
+from git_components.commit_store import (
+    LOG_FORMAT,
+    CommitStore,
+    commit_to_record,
+    date_range_bounds,
+    parse_log_output,
+    read_commit_graph,
+    walk_by_date,
+)
+from git_components.change_tracker import ChangeTracker
+from git_components.git_config import author_pattern, read_user_name, run_git
+from git_components.repo_index import RepoIndex
+from metrics_components.metrics import repo_collect_errors, repo_collect_seconds, repo_collect_skipped
+
+CONNECTOR_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def git_approxidate(date: str) -> float:
+    """
+    Unix time git uses for --since/--until=YYYY-MM-DD: that day at the current
+    local time of day, which is how the connector scripts' date ranges behave.
+    """
+    now = datetime.now()
+    day = datetime.strptime(date, "%Y-%m-%d")
+    return day.replace(hour=now.hour, minute=now.minute, second=now.second).timestamp()
+
+
+def render_branch_logs(repo_name: str, commits_by_branch: Dict[str, List[Tuple]], short_shas: Dict[str, str]) -> str:
+    """Lay out commits per branch exactly like the git connector scripts print them"""
+    lines = [f"=== Project: {repo_name} ==="]
+    for branch, commits in commits_by_branch.items():
+        lines.append(f"===== Branch: {branch} =====")
+        lines.extend(f"{commit[3]} {short_shas[commit[0]]} {commit[6]}" for commit in commits)
+        lines.append("")
+    return "\n".join(lines).strip()
+
+
+def empty_logs(repo_path: str) -> str:
+    """The log block of a repository without matching commits"""
+    return render_branch_logs(os.path.basename(os.path.normpath(repo_path)), {}, {})
+
+
+class ShellLogBackend:
+    """
+    The original git connector scripts: per repository one bash process, which
+    runs `git config`, `git rev-parse`, `git for-each-ref` and one `git log` per branch.
+    """
+    name = "shell"
+
+    def logs_for_days(self, repo_path: str, days: int) -> str:
+        command = [os.path.join(CONNECTOR_DIR, "eod_git_connector.sh"), "--path", repo_path, "--days", str(days)]
+        try:
+            result = subprocess.run(command, check=True, capture_output=True, text=True)
+            return result.stdout.strip()
+        except subprocess.CalledProcessError as e:
+            logging.error(f"Error getting git logs: {e.stderr}")
+            raise e
+
+    def logs_for_date_range(self, repo_path: str, start_date: str, end_date: str) -> str:
+        command = [
+            os.path.join(CONNECTOR_DIR, "sprint_review_git_connector.sh"),
+            "--path", repo_path,
+            "--start-date", start_date,
+            "--end-date", end_date
+        ]
+        result = subprocess.run(command, check=True, capture_output=True, text=True)
+        return result.stdout.strip()
+
+    def records(
+        self,
+        repo_path: str,
+        since: float,
+        until: Optional[float] = None,
+        all_authors: bool = False
+    ) -> List[CommitRecord]:
+        repo_name = os.path.basename(os.path.normpath(repo_path))
+        author_name = run_git(repo_path, "config", "user.name", check=False).stdout.strip()
+        branches = run_git(repo_path, "for-each-ref", "--format=%(refname:short)", "refs/heads/").stdout.split()
+        filters = [f"--since=@{int(since)}"]
+        if until is not None:
+            filters.append(f"--until=@{int(until)}")
+        if not all_authors:
+            filters.append(f"--author={author_name}")
+        records = []
+        for branch in branches:
+            log = run_git(
+                repo_path, "log", branch, *filters,
+                f"--format={LOG_FORMAT}", "--date=short", "--"
+            )
+            records.extend(commit_to_record(repo_name, branch, commit) for commit in parse_log_output(log.stdout))
+        return records
+
+
+class SinglePassLogBackend:
+    """
+    One `git log --branches` per repository. Branch membership is worked out
+    from the parent hashes and branch tips in that output, user.name is read
+    from the config files, and author and --until filtering happen in Python,
+    so a repository costs a single git process however many branches it has.
+    """
+    name = "single-pass"
+
+    def read(
+        self,
+        repo_path: str,
+        since: float,
+        until: Optional[float] = None,
+        all_authors: bool = False
+    ) -> Tuple[Dict[str, List[Tuple]], Dict[str, str]]:
+        """
+        Return commit tuples (as parse_log_output builds them) per branch, sorted
+        by branch name and newest first like `git log <branch>`, plus abbreviated hashes.
+        """
+        author_regex = None
+        if not all_authors:
+            author_name = read_user_name(repo_path)
+            if author_name:
+                author_regex = author_pattern(author_name)
+
+        # --until is applied below: commits newer than it must still link their parents into the graph
+        commits, parents, short_shas, tips = read_commit_graph(repo_path, since)
+
+        def included(commit: Tuple) -> bool:
+            if until is not None and commit[4] > until:
+                return False
+            return author_regex is None or bool(author_regex.search(f"{commit[1]} <{commit[2]}>"))
+
+        commits_by_branch: Dict[str, List[Tuple]] = {}
+        for branch, tip in sorted(tips.items(), key=lambda item: item[0].encode()):
+            branch_commits = [commits[sha] for sha in walk_by_date(tip, commits, parents) if included(commits[sha])]
+            if branch_commits:
+                commits_by_branch[branch] = branch_commits
+        return commits_by_branch, short_shas
+
+    def logs_for_days(self, repo_path: str, days: int) -> str:
+        commits_by_branch, short_shas = self.read(repo_path, time.time() - days * 86400)
+        return render_branch_logs(os.path.basename(os.path.normpath(repo_path)), commits_by_branch, short_shas)
+
+    def logs_for_date_range(self, repo_path: str, start_date: str, end_date: str) -> str:
+        commits_by_branch, short_shas = self.read(
+            repo_path, git_approxidate(start_date), git_approxidate(end_date)
+        )
+        return render_branch_logs(os.path.basename(os.path.normpath(repo_path)), commits_by_branch, short_shas)
+
+    def records(
+        self,
+        repo_path: str,
+        since: float,
+        until: Optional[float] = None,
+        all_authors: bool = False
+    ) -> List[CommitRecord]:
+        repo_name = os.path.basename(os.path.normpath(repo_path))
+        commits_by_branch, _ = self.read(repo_path, since, until, all_authors)
+        return [
+            commit_to_record(repo_name, branch, commit)
+            for branch, commits in commits_by_branch.items()
+            for commit in commits
+        ]
+
+
+LOG_BACKENDS = {backend.name: backend for backend in (ShellLogBackend, SinglePassLogBackend)}
+
+
+def make_log_backend(name: str):
+    if name not in LOG_BACKENDS:
+        raise ValueError(f"Unknown GIT_LOG_BACKEND {name!r}, expected one of {', '.join(LOG_BACKENDS)}")
+    return LOG_BACKENDS[name]()
+
 
 class GitLogFetcher:
-    def __init__(self, root_path: str = root_path):
+    def __init__(self, root_path: str = root_path, max_workers: int = git_log_workers):
         self.root_path = root_path
+        self.max_workers = max(1, max_workers)
+        self.log_backend = make_log_backend(git_log_backend)
+        self.repo_index = RepoIndex(
+            root_path,
+            repo_index_file,
+            ignore_dirs=scan_ignore_dirs,
+            nested_repos=scan_nested_repos
+        )
+        self.commit_store: Optional[CommitStore] = (
+            CommitStore(commit_store_file, horizon_days=commit_store_horizon_days)
+            if commit_store_enabled else None
+        )
+        self.change_tracker: Optional[ChangeTracker] = (
+            ChangeTracker(change_state_file, watch=watch_repos) if change_tracking_enabled else None
+        )
 
-    def get_git_repo_paths(self) -> list:
+    def get_git_repo_paths(self, refresh: bool = False) -> list:
         """
         Returns a list of paths under root_path that are Git repositories.
+        Uses the on-disk repository index unless refresh is requested or it is stale.
         """
         logging.info("Searching for Git repositories")
-        git_repos = []
-        for dirpath, dir_names, filenames in os.walk(self.root_path):
-            if ".git" in dir_names:
-                git_repos.append(dirpath)
-                dir_names.remove(".git")
+        git_repos = self.repo_index.get_repo_paths(refresh=refresh)
         logging.info(f"Found {len(git_repos)} Git repositories")
         return git_repos
 
+    def run_per_repo(self, fetch: Callable[[str], Any], repo_paths: Optional[List[str]] = None) -> list:
+        """
+        Runs fetch for every repository using a bounded thread pool.
+        Returns (repo_path, value, error, elapsed) tuples in the order of repo_paths;
+        a failing repository reports its error instead of aborting the whole batch.
+        """
+        if repo_paths is None:
+            repo_paths = self.get_git_repo_paths()
+
+        def timed_fetch(repo_path: str) -> tuple:
+            started = time.perf_counter()
+            value, error = None, None
+            try:
+                value = fetch(repo_path)
+            except subprocess.CalledProcessError as e:
+                logging.error(f"Error getting git logs for {repo_path}: {e.stderr}")
+                error = (e.stderr or str(e)).strip()
+            except Exception as e:
+                logging.error(f"Error getting git logs for {repo_path}: {e}")
+                error = str(e)
+            return repo_path, value, error, time.perf_counter() - started
+
+        started = time.perf_counter()
+        workers = min(self.max_workers, len(repo_paths)) or 1
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="git-log") as executor:
+            results = list(executor.map(timed_fetch, repo_paths))
+        if self.change_tracker:
+            self.change_tracker.save()
+
+        for repo_path, _, error, elapsed in results:
+            repo_name = os.path.basename(os.path.normpath(repo_path))
+            repo_collect_seconds.observe(elapsed, repo=repo_name)
+            if error is not None:
+                repo_collect_errors.inc(repo=repo_name)
+        for repo_path, _, _, elapsed in sorted(results, key=lambda result: result[3], reverse=True):
+            logging.info(f"Collected logs for {repo_path} in {elapsed:.2f}s")
+        logging.info(
+            f"Collected logs for {len(repo_paths)} repositories in "
+            f"{time.perf_counter() - started:.2f}s using {workers} worker(s)"
+        )
+        return results
+
+    def skip_unchanged(
+        self,
+        fetch: Callable[[str], Any],
+        empty: Callable[[str], Any],
+        since: float,
+        until: Optional[float] = None,
+        all_authors: bool = False,
+        skipped: Optional[List[str]] = None
+    ) -> Callable[[str], Any]:
+        """
+        Wraps a per-repository fetch so repositories that had no commits in an
+        earlier window containing [since, until], and whose refs have not changed
+        since, return empty(repo_path) without querying git. Skipped repositories
+        are appended to skipped.
+        """
+        if not self.change_tracker:
+            return fetch
+        tracker = self.change_tracker
+        scope = "all" if all_authors else "owner"
+
+        def tracked_fetch(repo_path: str) -> Any:
+            # Taken before the query, so commits made while it runs are seen as a change next time
+            state = tracker.state(repo_path)
+            if tracker.is_quiet(repo_path, scope, state, since, until):
+                if skipped is not None:
+                    skipped.append(repo_path)
+                repo_collect_skipped.inc(repo=os.path.basename(os.path.normpath(repo_path)))
+                return empty(repo_path)
+            value = fetch(repo_path)
+            tracker.record(repo_path, scope, state, since, until, value == empty(repo_path))
+            return value
+
+        return tracked_fetch
+
+    def collect_logs(self, fetch: Callable[[str], str], repo_paths: Optional[List[str]] = None) -> list:
+        """
+        Returns the text logs produced by fetch for every repository, in repository order.
+        """
+        return [
+            self.format_repo_error(repo_path, error) if error is not None else value
+            for repo_path, value, error, _ in self.run_per_repo(fetch, repo_paths)
+        ]
+
+    def collect_commits(
+        self,
+        fetch: Callable[[str], List[CommitRecord]],
+        repo_paths: Optional[List[str]] = None,
+        skipped: Optional[List[str]] = None
+    ) -> CommitCollection:
+        """
+        Returns the de-duplicated commit records produced by fetch for every repository,
+        with skipped listing the repositories that fetch answered from change tracking.
+        """
+        records, errors, timings = [], {}, {}
+        for repo_path, value, error, elapsed in self.run_per_repo(fetch, repo_paths):
+            timings[repo_path] = elapsed
+            if error is not None:
+                errors[repo_path] = error
+            else:
+                records.extend(value)
+        return CommitCollection(deduplicate(records), errors, timings, skipped)
+
+    @staticmethod
+    def format_repo_error(repo_path: str, message: str) -> str:
+        """
+        Returns the log block reported for a repository whose logs could not be collected.
+        """
+        return f"=== Project: {os.path.basename(repo_path)} ===\nError: {message}"
+
     def get_git_logs(self, days: int = 1) -> list:
         """
         Returns a list of logs for all Git repositories under root_path.
         """
         logging.info(f"Getting git logs for past {days} day(s)")
-        logs = []
-        for repo_path in self.get_git_repo_paths():
-            logs.append(self.get_git_logs_for_single_repo(repo_path, days=days))
-        return logs
+        since = time.time() - days * 86400
+        if self.commit_store and self.commit_store.covers(since):
+            fetch = lambda repo_path: self.get_cached_logs_for_single_repo(repo_path, since)
+        else:
+            fetch = lambda repo_path: self.get_git_logs_for_single_repo(repo_path, days=days)
+        return self.collect_logs(self.skip_unchanged(fetch, empty_logs, since))
+
+    def get_cached_logs_for_single_repo(self, repo_path: str, since: float, until: Optional[float] = None) -> str:
+        """
+        Returns logs for a single Git repository from the commit store,
+        fetching only the commits added since the last sync.
+        """
+        self.commit_store.sync_repo(repo_path)
+        return self.commit_store.render_logs(repo_path, since, until)
 
     def get_git_logs_for_single_repo(self, repo_path: str, days: int = 1) -> str:
         """
         Returns logs for a single Git repository based on past number of days.
         """
         logging.info(f"Getting logs for repository: {repo_path}")
-        script_path = "git_components/eod_git_connector.sh"
-        command = [script_path, "--path", repo_path, "--days", str(days)]
-        try:
-            result = subprocess.run(command, check=True, capture_output=True, text=True)
-            return result.stdout.strip()
-        except subprocess.CalledProcessError as e:
-            logging.error(f"Error getting git logs: {e.stderr}")
-            raise e
+        return self.log_backend.logs_for_days(repo_path, days)
+
+    def get_git_logs_for_date_range_single_repo(self, repo_path: str, start_date: str, end_date: str) -> str:
+        """
+        Returns logs for a single Git repository between given start and end dates.
+        """
+        return self.log_backend.logs_for_date_range(repo_path, start_date, end_date)
 
     def get_git_logs_by_date_range(self, start_date: str, end_date: str) -> list:
         """
@@ -50,19 +368,60 @@ class GitLogFetcher:
         Dates must be in 'YYYY-MM-DD' format.
         """
         logging.info(f"Getting git logs from {start_date} to {end_date}")
-        logs = []
-        script_path = "git_components/sprint_review_git_connector.sh"
-        for repo_path in self.get_git_repo_paths():
-            command = [
-                script_path,
-                "--path", repo_path,
-                "--start-date", start_date,
-                "--end-date", end_date
-            ]
-            try:
-                result = subprocess.run(command, check=True, capture_output=True, text=True)
-                logs.append(result.stdout.strip())
-            except subprocess.CalledProcessError as e:
-                logging.error(f"Error getting git logs for {repo_path}: {e.stderr}")
-                raise e
-        return logs
\ No newline at end of file
+        since, until = date_range_bounds(start_date, end_date)
+        if self.commit_store and self.commit_store.covers(since):
+            fetch = lambda repo_path: self.get_cached_logs_for_single_repo(repo_path, since, until)
+        else:
+            # Live queries pass the dates to git, which reads them as that day at the current time
+            since, until = git_approxidate(start_date), git_approxidate(end_date)
+            fetch = lambda repo_path: self.get_git_logs_for_date_range_single_repo(repo_path, start_date, end_date)
+        return self.collect_logs(self.skip_unchanged(fetch, empty_logs, since, until))
+
+    def get_commit_records(self, days: int = 1, all_authors: bool = False) -> CommitCollection:
+        """
+        Returns structured commit records for all Git repositories for the past number of days.
+        Only the repository owner's commits are included unless all_authors is set.
+        """
+        logging.info(f"Getting commit records for past {days} day(s)")
+        since = time.time() - days * 86400
+        skipped: List[str] = []
+        return self.collect_commits(self.skip_unchanged(
+            lambda repo_path: self.get_commit_records_for_single_repo(repo_path, since, all_authors=all_authors),
+            lambda repo_path: [],
+            since,
+            all_authors=all_authors,
+            skipped=skipped
+        ), skipped=skipped)
+
+    def get_commit_records_by_date_range(self, start_date: str, end_date: str) -> CommitCollection:
+        """
+        Returns structured commit records for all Git repositories between given start and end dates.
+        Dates must be in 'YYYY-MM-DD' format.
+        """
+        logging.info(f"Getting commit records from {start_date} to {end_date}")
+        since, until = date_range_bounds(start_date, end_date)
+        skipped: List[str] = []
+        return self.collect_commits(self.skip_unchanged(
+            lambda repo_path: self.get_commit_records_for_single_repo(repo_path, since, until),
+            lambda repo_path: [],
+            since,
+            until,
+            skipped=skipped
+        ), skipped=skipped)
+
+    def get_commit_records_for_single_repo(
+        self,
+        repo_path: str,
+        since: float,
+        until: Optional[float] = None,
+        all_authors: bool = False
+    ) -> List[CommitRecord]:
+        """
+        Returns the repository owner's (or with all_authors, everyone's) commit records
+        for a single repository, from the commit store when it covers the range and from git otherwise.
+        """
+        if self.commit_store and self.commit_store.covers(since):
+            self.commit_store.sync_repo(repo_path)
+            return self.commit_store.get_records(repo_path, since, until, all_authors=all_authors)
+
+        return self.log_backend.records(repo_path, since, until, all_authors)
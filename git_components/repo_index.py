@@ -0,0 +1,108 @@
+import json
+import logging
+import os
+import threading
+from typing import Dict, Iterable, List, Optional
+
+
+class RepoIndex:
+    """
+    Disk-backed index of the Git repositories found under a root directory.
+
+    The index remembers the mtime of every directory it visited. Adding or
+    removing an entry in a directory changes its mtime, so the cached list is
+    reused until one of those directories changes.
+    """
+
+    def __init__(
+        self,
+        root_path: str,
+        index_file: str,
+        ignore_dirs: Iterable[str] = (),
+        nested_repos: bool = False
+    ):
+        self.root_path = root_path
+        self.index_file = index_file
+        self.ignore_dirs = set(ignore_dirs)
+        self.nested_repos = nested_repos
+        self._lock = threading.Lock()
+        self._index: Optional[Dict] = None
+
+    def get_repo_paths(self, refresh: bool = False) -> List[str]:
+        """Return the indexed repositories, rescanning if forced or stale"""
+        with self._lock:
+            if self._index is None:
+                self._index = self._load_index()
+            if refresh or not self._is_valid(self._index):
+                self._index = self._scan()
+                self._save_index(self._index)
+            return list(self._index["repos"])
+
+    def refresh(self) -> List[str]:
+        """Force a rescan of root_path"""
+        return self.get_repo_paths(refresh=True)
+
+    def _is_valid(self, index: Optional[Dict]) -> bool:
+        if not index:
+            return False
+        if index.get("root") != self.root_path or index.get("nested") != self.nested_repos:
+            return False
+        if sorted(index.get("ignore", [])) != sorted(self.ignore_dirs):
+            return False
+        for path, mtime in index.get("dirs", {}).items():
+            try:
+                if os.stat(path).st_mtime_ns != mtime:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def _scan(self) -> Dict:
+        logging.info(f"Scanning {self.root_path} for Git repositories")
+        repos = []
+        dirs = {}
+        for dirpath, dir_names, filenames in os.walk(self.root_path):
+            try:
+                dirs[dirpath] = os.stat(dirpath).st_mtime_ns
+            except OSError:
+                continue
+
+            is_repo = ".git" in dir_names or (self.nested_repos and ".git" in filenames)
+            if is_repo:
+                repos.append(dirpath)
+                if not self.nested_repos:
+                    dir_names.clear()
+                    continue
+
+            dir_names[:] = [
+                name for name in dir_names
+                if name != ".git" and name not in self.ignore_dirs
+            ]
+        logging.info(f"Indexed {len(repos)} Git repositories across {len(dirs)} directories")
+        return {
+            "root": self.root_path,
+            "nested": self.nested_repos,
+            "ignore": sorted(self.ignore_dirs),
+            "repos": repos,
+            "dirs": dirs
+        }
+
+    def _load_index(self) -> Optional[Dict]:
+        try:
+            with open(self.index_file, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logging.warning(f"Ignoring unreadable repository index {self.index_file}: {e}")
+            return None
+
+    def _save_index(self, index: Dict) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.index_file) or ".", exist_ok=True)
+            tmp_file = f"{self.index_file}.tmp"
+            with open(tmp_file, 'w') as f:
+                json.dump(index, f)
+            os.replace(tmp_file, self.index_file)
+        except OSError as e:
+            logging.warning(f"Could not save repository index {self.index_file}: {e}")
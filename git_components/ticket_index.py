@@ -0,0 +1,39 @@
+import re
+from typing import Dict, Iterable, List, Set
+from git_components.commit_records import CommitRecord
+
+# Ticket IDs such as ABC-123, also found in lower case in branch names like feat/abc-123-login
+TICKET_PATTERN = re.compile(r"(?<![A-Za-z0-9])([A-Za-z][A-Za-z0-9]+-\d+)(?![0-9])")
+
+
+def normalize_ticket(ticket: str) -> str:
+    return ticket.strip().upper()
+
+
+def extract_tickets(text: str) -> Set[str]:
+    """Return the ticket IDs mentioned in a branch name or commit message"""
+    return {normalize_ticket(match) for match in TICKET_PATTERN.findall(text or "")}
+
+
+class TicketIndex:
+    """Inverted index from ticket ID to the commits whose branch or message mention it"""
+
+    def __init__(self, records: Iterable[CommitRecord] = ()):
+        self._commits: Dict[str, List[CommitRecord]] = {}
+        for record in records:
+            self.add(record)
+
+    def add(self, record: CommitRecord) -> None:
+        tickets = extract_tickets(record.branch) | extract_tickets(record.subject) | extract_tickets(record.body)
+        for ticket in tickets:
+            self._commits.setdefault(ticket, []).append(record)
+
+    def tickets(self) -> List[str]:
+        return sorted(self._commits)
+
+    def commits_for(self, ticket: str) -> List[CommitRecord]:
+        return list(self._commits.get(normalize_ticket(ticket), []))
+
+    def group_by_ticket(self, tickets: Iterable[str]) -> Dict[str, List[CommitRecord]]:
+        """Return the commits linked to each requested ticket, keeping the request order"""
+        return {normalize_ticket(ticket): self.commits_for(ticket) for ticket in tickets if ticket.strip()}
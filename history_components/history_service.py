@@ -1,7 +1,11 @@
+import base64
 import json
 import os
-from datetime import datetime
-from typing import Dict, List, Optional
+import re
+import sqlite3
+import threading
+from datetime import date as date_type, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
 import uuid
 
 class HistoryEntry:
@@ -11,13 +15,15 @@ class HistoryEntry:
         response: str,
         status: str,
         date: Optional[str] = None,
-        entry_id: Optional[str] = None
+        entry_id: Optional[str] = None,
+        cached: bool = False
     ):
         self.id = entry_id or str(uuid.uuid4())
         self.type = entry_type
         self.date = date or datetime.now().isoformat()
         self.response = response
         self.status = status
+        self.cached = cached
 
     def to_dict(self) -> Dict:
         return {
@@ -25,7 +31,8 @@ class HistoryEntry:
             "type": self.type,
             "date": self.date,
             "response": self.response,
-            "status": self.status
+            "status": self.status,
+            "cached": self.cached
         }
 
     @classmethod
@@ -35,40 +42,163 @@ class HistoryEntry:
             response=data["response"],
             status=data["status"],
             date=data["date"],
-            entry_id=data["id"]
+            entry_id=data["id"],
+            cached=data.get("cached", False)
         )
 
 class HistoryService:
-    HISTORY_FILE = "data/.history.json"
+    HISTORY_DB = "data/.history.db"
+    LEGACY_HISTORY_FILE = "data/.history.json"
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS history (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        id TEXT NOT NULL UNIQUE,
+        type TEXT NOT NULL,
+        date TEXT NOT NULL,
+        response TEXT NOT NULL,
+        status TEXT NOT NULL,
+        cached INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE INDEX IF NOT EXISTS idx_history_date ON history (date);
+    CREATE INDEX IF NOT EXISTS idx_history_date_seq ON history (date DESC, seq DESC);
+    CREATE TABLE IF NOT EXISTS history_meta (
+        key TEXT PRIMARY KEY,
+        value INTEGER NOT NULL
+    );
+    INSERT OR IGNORE INTO history_meta VALUES ('revision', 0);
+    CREATE TRIGGER IF NOT EXISTS history_insert_revision AFTER INSERT ON history BEGIN
+        UPDATE history_meta SET value = value + 1 WHERE key = 'revision';
+    END;
+    CREATE TRIGGER IF NOT EXISTS history_update_revision AFTER UPDATE ON history BEGIN
+        UPDATE history_meta SET value = value + 1 WHERE key = 'revision';
+    END;
+    CREATE TRIGGER IF NOT EXISTS history_delete_revision AFTER DELETE ON history BEGIN
+        UPDATE history_meta SET value = value + 1 WHERE key = 'revision';
+    END;
+    """
+
+    # Full-text index over responses, kept in sync by triggers. It is an external-content
+    # FTS5 table, so the text is stored once in history and only the index is added.
+    SEARCH_SCHEMA = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS history_fts USING fts5(
+        response, content='history', content_rowid='seq', tokenize='porter unicode61'
+    );
+    CREATE TRIGGER IF NOT EXISTS history_fts_insert AFTER INSERT ON history BEGIN
+        INSERT INTO history_fts (rowid, response) VALUES (new.seq, new.response);
+    END;
+    CREATE TRIGGER IF NOT EXISTS history_fts_delete AFTER DELETE ON history BEGIN
+        INSERT INTO history_fts (history_fts, rowid, response) VALUES ('delete', old.seq, old.response);
+    END;
+    CREATE TRIGGER IF NOT EXISTS history_fts_update AFTER UPDATE OF response ON history BEGIN
+        INSERT INTO history_fts (history_fts, rowid, response) VALUES ('delete', old.seq, old.response);
+        INSERT INTO history_fts (rowid, response) VALUES (new.seq, new.response);
+    END;
+    """
+
+    # Characters of the response included in summary-only listings
+    PREVIEW_LENGTH = 200
+
+    # Tokens of context shown around each match in search results
+    SNIPPET_TOKENS = 16
 
     def __init__(self):
-        self.ensure_history_file()
+        # The database is created and migrated on first use so importing the app stays cheap
+        self._ready = False
+        self._ready_lock = threading.Lock()
+        self.search_enabled = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._ready:
+            self.ensure_history_file()
+        return self._open()
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.HISTORY_DB, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @staticmethod
+    def _to_row(entry: HistoryEntry) -> tuple:
+        return (entry.id, entry.type, entry.date, entry.response, entry.status, int(entry.cached))
+
+    @staticmethod
+    def _from_row(row: sqlite3.Row) -> Dict:
+        return {
+            "id": row["id"],
+            "type": row["type"],
+            "date": row["date"],
+            "response": row["response"],
+            "status": row["status"],
+            "cached": bool(row["cached"])
+        }
 
     def ensure_history_file(self) -> None:
-        """Ensure the history file and directory exist"""
-        os.makedirs(os.path.dirname(self.HISTORY_FILE), exist_ok=True)
-        if not os.path.exists(self.HISTORY_FILE):
-            with open(self.HISTORY_FILE, 'w') as f:
-                json.dump([], f)
+        """Ensure the history database exists and migrate the legacy JSON history into it"""
+        with self._ready_lock:
+            if self._ready:
+                return
+            os.makedirs(os.path.dirname(self.HISTORY_DB) or ".", exist_ok=True)
+            with self._open() as conn:
+                conn.executescript(self.SCHEMA)
+            self.search_enabled = self.ensure_search_index()
+            self.migrate_legacy_history()
+            self._ready = True
 
-    def load_history(self) -> List[Dict]:
-        """Load history from file with error handling"""
+    def ensure_search_index(self) -> bool:
+        """
+        Create the full-text index, indexing existing entries the first time.
+        Returns False when SQLite was built without FTS5; search then scans responses instead.
+        """
         try:
-            with open(self.HISTORY_FILE, 'r') as f:
-                try:
-                    return json.load(f)
-                except json.JSONDecodeError:
-                    print(f"Error decoding {self.HISTORY_FILE}, creating new history")
-                    return []
-        except FileNotFoundError:
-            self.ensure_history_file()
-            return []
+            with self._open() as conn:
+                exists = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'history_fts'"
+                ).fetchone()
+                conn.executescript(self.SEARCH_SCHEMA)
+                if not exists:
+                    conn.execute("INSERT INTO history_fts (history_fts) VALUES ('rebuild')")
+            return True
+        except sqlite3.OperationalError as e:
+            print(f"Full-text search unavailable, falling back to substring search: {str(e)}")
+            return False
+
+    def migrate_legacy_history(self) -> None:
+        """Import entries from the old JSON history file once, then move it aside"""
+        if not os.path.exists(self.LEGACY_HISTORY_FILE):
+            return
+        try:
+            with open(self.LEGACY_HISTORY_FILE, 'r') as f:
+                legacy_history = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Error reading legacy history {self.LEGACY_HISTORY_FILE}, skipping migration: {str(e)}")
+            return
+        entries = [HistoryEntry.from_dict(entry) for entry in legacy_history]
+        with self._open() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO history (id, type, date, response, status, cached) VALUES (?, ?, ?, ?, ?, ?)",
+                [self._to_row(entry) for entry in entries]
+            )
+        os.replace(self.LEGACY_HISTORY_FILE, f"{self.LEGACY_HISTORY_FILE}.migrated")
+        print(f"Migrated {len(entries)} history entries to {self.HISTORY_DB}")
+
+    def load_history(self) -> List[Dict]:
+        """Load all history entries in insertion order"""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM history ORDER BY seq").fetchall()
+        return [self._from_row(row) for row in rows]
 
     def save_history(self, history: List[Dict]) -> None:
-        """Save history to file with error handling"""
+        """Replace the whole history with error handling"""
         try:
-            with open(self.HISTORY_FILE, 'w') as f:
-                json.dump(history, f, indent=2)
+            with self._connect() as conn:
+                conn.execute("DELETE FROM history")
+                conn.executemany(
+                    "INSERT INTO history (id, type, date, response, status, cached) VALUES (?, ?, ?, ?, ?, ?)",
+                    [self._to_row(HistoryEntry.from_dict(entry)) for entry in history]
+                )
         except Exception as e:
             print(f"Error saving history: {str(e)}")
             raise
@@ -76,27 +206,188 @@ class HistoryService:
     def add_entry(self, entry: HistoryEntry) -> None:
         """Add a new entry to history"""
         try:
-            history = self.load_history()
-            history.append(entry.to_dict())
-            self.save_history(history)
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT INTO history (id, type, date, response, status, cached) VALUES (?, ?, ?, ?, ?, ?)",
+                    self._to_row(entry)
+                )
         except Exception as e:
             print(f"Error adding history entry: {str(e)}")
             raise
 
+    def add_entries(self, entries: List[HistoryEntry]) -> None:
+        """Add several entries to history in a single write"""
+        try:
+            with self._connect() as conn:
+                conn.executemany(
+                    "INSERT INTO history (id, type, date, response, status, cached) VALUES (?, ?, ?, ?, ?, ?)",
+                    [self._to_row(entry) for entry in entries]
+                )
+        except Exception as e:
+            print(f"Error adding history entries: {str(e)}")
+            raise
+
     def get_all_entries(self) -> List[HistoryEntry]:
         """Get all history entries sorted by date"""
         try:
-            history = self.load_history()
-            entries = [HistoryEntry.from_dict(entry) for entry in history]
-            return sorted(entries, key=lambda x: x.date, reverse=True)
+            with self._connect() as conn:
+                rows = conn.execute("SELECT * FROM history ORDER BY date DESC").fetchall()
+            return [HistoryEntry.from_dict(self._from_row(row)) for row in rows]
         except Exception as e:
             print(f"Error retrieving history entries: {str(e)}")
             raise
 
+    def get_revision(self) -> int:
+        """Return a counter that changes whenever any history entry is added, updated or deleted"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT value FROM history_meta WHERE key = 'revision'").fetchone()
+        return row[0] if row else 0
+
+    @staticmethod
+    def encode_cursor(date: str, seq: int) -> str:
+        return base64.urlsafe_b64encode(f"{date}|{seq}".encode()).decode()
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[str, int]:
+        try:
+            date, seq = base64.urlsafe_b64decode(cursor.encode()).decode().rsplit("|", 1)
+            return date, int(seq)
+        except (ValueError, UnicodeDecodeError) as e:
+            raise ValueError(f"Invalid cursor: {cursor}") from e
+
+    def list_entries(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        include_response: bool = True
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Get one page of entries, newest first, and the cursor of the next page.
+        Without include_response only a short preview of each response is returned.
+        """
+        columns = "seq, id, type, date, status, cached, " + (
+            "response" if include_response else f"substr(response, 1, {self.PREVIEW_LENGTH}) AS preview"
+        )
+        query = f"SELECT {columns} FROM history"
+        params: list = []
+        if cursor:
+            date, seq = self.decode_cursor(cursor)
+            query += " WHERE date < ? OR (date = ? AND seq < ?)"
+            params += [date, date, seq]
+        query += " ORDER BY date DESC, seq DESC LIMIT ?"
+        params.append(limit + 1)
+        try:
+            with self._connect() as conn:
+                rows = conn.execute(query, params).fetchall()
+        except Exception as e:
+            print(f"Error listing history entries: {str(e)}")
+            raise
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = self.encode_cursor(rows[-1]["date"], rows[-1]["seq"])
+        entries = []
+        for row in rows:
+            entry = {key: row[key] for key in row.keys() if key != "seq"}
+            entry["cached"] = bool(entry["cached"])
+            entries.append(entry)
+        return entries, next_cursor
+
+    @staticmethod
+    def build_match_query(query: str) -> str:
+        """
+        Turn free text into an FTS5 query: every word must match, the last one as a prefix
+        so partial input still finds results. Quoting keeps FTS5 syntax out of user input.
+        """
+        terms = re.findall(r"\w+", query)
+        if not terms:
+            return ""
+        quoted = [f'"{term}"' for term in terms]
+        quoted[-1] += "*"
+        return " ".join(quoted)
+
+    @staticmethod
+    def date_bounds(date_from: Optional[str], date_to: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+        """Convert inclusive YYYY-MM-DD filters into ISO bounds [start, end) comparable with entry dates"""
+        start = date_type.fromisoformat(date_from).isoformat() if date_from else None
+        end = (date_type.fromisoformat(date_to) + timedelta(days=1)).isoformat() if date_to else None
+        return start, end
+
+    def search_entries(
+        self,
+        query: str,
+        entry_type: Optional[str] = None,
+        status: Optional[str] = None,
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> List[Dict]:
+        """
+        Full-text search over responses, best matches first (BM25), with optional
+        type, status and inclusive date filters. Each result carries a snippet
+        around the matches instead of the full response.
+        Raises ValueError for malformed dates.
+        """
+        match = self.build_match_query(query)
+        if not match:
+            return []
+        start, end = self.date_bounds(date_from, date_to)
+        filters, params = [], []
+        for clause, value in (
+            ("h.type = ?", entry_type),
+            ("h.status = ?", status),
+            ("h.date >= ?", start),
+            ("h.date < ?", end),
+        ):
+            if value:
+                filters.append(clause)
+                params.append(value)
+
+        with self._connect() as conn:
+            if self.search_enabled:
+                sql = (
+                    "SELECT h.id, h.type, h.date, h.status, h.cached, "
+                    f"snippet(history_fts, 0, '[', ']', '…', {self.SNIPPET_TOKENS}) AS snippet, "
+                    "bm25(history_fts) AS score "
+                    "FROM history_fts JOIN history h ON h.seq = history_fts.rowid "
+                    "WHERE history_fts MATCH ?"
+                )
+                sql += "".join(f" AND {clause}" for clause in filters)
+                sql += " ORDER BY score, h.seq DESC LIMIT ? OFFSET ?"
+                rows = conn.execute(sql, [match, *params, limit, offset]).fetchall()
+            else:
+                terms = re.findall(r"\w+", query)
+                filters += ["h.response LIKE ?"] * len(terms)
+                params += [f"%{term}%" for term in terms]
+                sql = (
+                    "SELECT h.id, h.type, h.date, h.status, h.cached, "
+                    f"substr(h.response, 1, {self.PREVIEW_LENGTH}) AS snippet, 0 AS score "
+                    f"FROM history h WHERE {' AND '.join(filters)} "
+                    "ORDER BY h.date DESC, h.seq DESC LIMIT ? OFFSET ?"
+                )
+                rows = conn.execute(sql, [*params, limit, offset]).fetchall()
+
+        return [
+            {
+                "id": row["id"],
+                "type": row["type"],
+                "date": row["date"],
+                "status": row["status"],
+                "cached": bool(row["cached"]),
+                "snippet": row["snippet"],
+                # bm25 is lower-is-better; negate it so higher scores rank first
+                "score": round(-row["score"], 4),
+            }
+            for row in rows
+        ]
+
     def clear_history(self) -> None:
         """Clear all history entries"""
         try:
-            self.save_history([])
+            with self._connect() as conn:
+                conn.execute("DELETE FROM history")
         except Exception as e:
             print(f"Error clearing history: {str(e)}")
             raise
@@ -104,11 +395,9 @@ class HistoryService:
     def get_entry_by_id(self, entry_id: str) -> Optional[HistoryEntry]:
         """Get a specific entry by ID"""
         try:
-            history = self.load_history()
-            for entry in history:
-                if entry["id"] == entry_id:
-                    return HistoryEntry.from_dict(entry)
-            return None
+            with self._connect() as conn:
+                row = conn.execute("SELECT * FROM history WHERE id = ?", (entry_id,)).fetchone()
+            return HistoryEntry.from_dict(self._from_row(row)) if row else None
         except Exception as e:
             print(f"Error retrieving entry: {str(e)}")
             raise
@@ -116,12 +405,9 @@ class HistoryService:
     def delete_entry(self, entry_id: str) -> bool:
         """Delete a specific entry by ID"""
         try:
-            history = self.load_history()
-            filtered_history = [entry for entry in history if entry["id"] != entry_id]
-            if len(filtered_history) < len(history):
-                self.save_history(filtered_history)
-                return True
-            return False
+            with self._connect() as conn:
+                cursor = conn.execute("DELETE FROM history WHERE id = ?", (entry_id,))
+            return cursor.rowcount > 0
         except Exception as e:
             print(f"Error deleting entry: {str(e)}")
             raise
@@ -129,13 +415,12 @@ class HistoryService:
     def update_entry(self, entry_id: str, updated_entry: HistoryEntry) -> bool:
         """Update a specific entry by ID"""
         try:
-            history = self.load_history()
-            for i, entry in enumerate(history):
-                if entry["id"] == entry_id:
-                    history[i] = updated_entry.to_dict()
-                    self.save_history(history)
-                    return True
-            return False
+            with self._connect() as conn:
+                cursor = conn.execute(
+                    "UPDATE history SET id = ?, type = ?, date = ?, response = ?, status = ?, cached = ? WHERE id = ?",
+                    (*self._to_row(updated_entry), entry_id)
+                )
+            return cursor.rowcount > 0
         except Exception as e:
             print(f"Error updating entry: {str(e)}")
-            raise
\ No newline at end of file
+            raise
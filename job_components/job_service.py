@@ -0,0 +1,167 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+
+class JobQueueFull(Exception):
+    """Raised when a job is submitted while the queue is at its depth limit"""
+
+
+class Job:
+    """
+    A generation request running in the background.
+    Progress lines are kept so clients can attach, detach and re-attach to the stream.
+    """
+
+    def __init__(self, kind: str, key: str, params: Dict):
+        self.id = str(uuid.uuid4())
+        self.kind = kind
+        self.key = key
+        self.params = params
+        self.status = "queued"
+        self.events: List[str] = []
+        self.result: Optional[str] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self._condition = threading.Condition()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "error")
+
+    def append(self, event: str) -> None:
+        with self._condition:
+            self.events.append(event)
+            self._condition.notify_all()
+
+    def finish(self) -> None:
+        with self._condition:
+            self.status = "error" if self.error else "done"
+            self.finished_at = time.time()
+            self._condition.notify_all()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the job finishes; returns whether it did within timeout"""
+        with self._condition:
+            return self._condition.wait_for(lambda: self.finished, timeout)
+
+    def iter_events(self, start: int = 0, poll_seconds: float = 15.0) -> Iterator[str]:
+        """Yield events from index start, waiting for new ones until the job finishes"""
+        index = max(0, start)
+        while True:
+            with self._condition:
+                while index >= len(self.events) and not self.finished:
+                    self._condition.wait(timeout=poll_seconds)
+                pending = self.events[index:]
+                finished = self.finished
+            for event in pending:
+                yield event
+            index += len(pending)
+            if finished and index >= len(self.events):
+                return
+
+    def to_dict(self, include_events: bool = False) -> Dict:
+        data = {
+            "id": self.id,
+            "kind": self.kind,
+            "params": self.params,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "event_count": len(self.events)
+        }
+        if include_events:
+            data["events"] = list(self.events)
+        return data
+
+
+class JobService:
+    """
+    Runs generation pipelines on a bounded worker pool.
+
+    Submitting a request identical to one that is still queued or running
+    returns the existing job instead of starting another one (single-flight).
+    Finished jobs are kept for retention_seconds so results can be polled.
+    """
+
+    def __init__(self, max_workers: int = 2, max_queue_depth: int = 16, retention_seconds: float = 3600):
+        self.max_workers = max(1, max_workers)
+        self.max_queue_depth = max_queue_depth
+        self.retention_seconds = retention_seconds
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job")
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, Job] = {}
+        self._in_flight: Dict[str, Job] = {}
+
+    @staticmethod
+    def make_key(kind: str, params: Dict) -> str:
+        payload = json.dumps({"kind": kind, "params": params}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def submit(self, kind: str, params: Dict, pipeline: Callable[[Job], Iterator[str]]) -> Tuple[Job, bool]:
+        """
+        Queue pipeline for the request described by kind and params.
+        Returns the job and whether it was newly created.
+        """
+        key = self.make_key(kind, params)
+        with self._lock:
+            self._prune()
+            existing = self._in_flight.get(key)
+            if existing is not None:
+                logging.info(f"Attaching to in-flight {kind} job {existing.id}")
+                return existing, False
+            if len(self._in_flight) >= self.max_queue_depth:
+                raise JobQueueFull(f"Too many queued jobs ({len(self._in_flight)}), try again later")
+            job = Job(kind, key, params)
+            job.append(f"Job {job.id} queued\n")
+            self._jobs[job.id] = job
+            self._in_flight[key] = job
+        logging.info(f"Queued {kind} job {job.id}")
+        self._executor.submit(self._run, job, pipeline)
+        return job, True
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list_jobs(self) -> List[Job]:
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda job: job.created_at, reverse=True)
+
+    def active_count(self) -> int:
+        with self._lock:
+            return len(self._in_flight)
+
+    def _run(self, job: Job, pipeline: Callable[[Job], Iterator[str]]) -> None:
+        job.status = "running"
+        started = time.perf_counter()
+        try:
+            for event in pipeline(job):
+                job.append(event)
+        except Exception as e:
+            logging.error(f"Job {job.id} failed: {e}")
+            job.error = job.error or str(e)
+            job.append(f"Error: {str(e)}\n")
+        finally:
+            job.finish()
+            with self._lock:
+                if self._in_flight.get(job.key) is job:
+                    del self._in_flight[job.key]
+            logging.info(f"{job.kind} job {job.id} {job.status} in {time.perf_counter() - started:.2f}s")
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.retention_seconds
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished and job.finished_at < cutoff]:
+            del self._jobs[job_id]
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting work and optionally wait for running jobs to finish"""
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
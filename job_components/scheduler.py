@@ -0,0 +1,82 @@
+import hashlib
+import logging
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, List, Optional
+
+
+def commit_fingerprint(shas: Iterable[str]) -> str:
+    """Identify a set of commits independently of their order"""
+    return hashlib.sha256("\n".join(sorted(shas)).encode("utf-8")).hexdigest()
+
+
+class PrecomputedSummary:
+    """A summary generated ahead of time together with the commits it covers"""
+    __slots__ = ("response", "fingerprint", "generated_at", "checked_at")
+
+    def __init__(self, response: str, fingerprint: str, generated_at: float):
+        self.response = response
+        self.fingerprint = fingerprint
+        self.generated_at = generated_at
+        self.checked_at = generated_at
+
+    def is_fresh(self, max_age_seconds: float) -> bool:
+        """Fresh while the commits were last confirmed unchanged within max_age_seconds"""
+        return time.time() - self.checked_at <= max_age_seconds
+
+
+class DailyScheduler:
+    """
+    Runs a task in a background thread at fixed local times every day.
+    Times are "HH:MM" strings; invalid ones are logged and skipped. A run that
+    fails is logged and retried at the next time.
+    """
+
+    def __init__(self, times: List[str], task: Callable[[], None], name: str = "scheduler"):
+        self.times = []
+        for value in times:
+            try:
+                self.times.append(datetime.strptime(value, "%H:%M").time())
+            except ValueError:
+                logging.warning(f"Ignoring invalid {name} time {value!r}, expected HH:MM")
+        self.times.sort()
+        self.task = task
+        self.name = name
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def next_run(self, now: Optional[datetime] = None) -> Optional[datetime]:
+        if not self.times:
+            return None
+        now = now or datetime.now()
+        for scheduled in self.times:
+            candidate = datetime.combine(now.date(), scheduled)
+            if candidate > now:
+                return candidate
+        return datetime.combine(now.date() + timedelta(days=1), self.times[0])
+
+    def start(self) -> None:
+        if not self.times or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+        self._thread.start()
+        logging.info(f"{self.name} scheduled at {', '.join(t.strftime('%H:%M') for t in self.times)}")
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            next_run = self.next_run()
+            # Wake up at least every minute so clock changes are picked up
+            while not self._stop.is_set() and datetime.now() < next_run:
+                self._stop.wait(min(60.0, max(0.0, (next_run - datetime.now()).total_seconds())))
+            if self._stop.is_set():
+                return
+            started = time.perf_counter()
+            try:
+                self.task()
+                logging.info(f"{self.name} run finished in {time.perf_counter() - started:.2f}s")
+            except Exception as e:
+                logging.error(f"{self.name} run failed: {e}")
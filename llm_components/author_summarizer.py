@@ -0,0 +1,53 @@
+from typing import Callable, Dict, List
+from git_components.commit_records import CommitRecord
+from llm_components.group_summarizer import summarize_groups
+from llm_components.prompt_builder import build_commit_prompt
+from llm_components.summary_cache import SummaryCache
+
+
+class AuthorSummary:
+    """EOD summary for one author"""
+    __slots__ = ("author", "summary", "commit_count", "cached")
+
+    def __init__(self, author: str, summary: str, commit_count: int, cached: bool):
+        self.author = author
+        self.summary = summary
+        self.commit_count = commit_count
+        self.cached = cached
+
+
+def summarize_authors(
+    commits_by_author: Dict[str, List[CommitRecord]],
+    generator: Callable[..., str],
+    summary_cache: SummaryCache,
+    model: str,
+    prompt_version: str,
+    token_budget: int,
+    max_workers: int = 2,
+    use_cache: bool = True
+) -> List[AuthorSummary]:
+    """
+    Generate one EOD summary per author, with at most max_workers LLM calls
+    in flight. Summaries share the EOD cache, so an author whose commits are
+    unchanged since the last run is not regenerated.
+    """
+    summaries = summarize_groups(
+        commits_by_author,
+        lambda author, records: {"collected_commits": build_commit_prompt(records, token_budget).text},
+        generator,
+        summary_cache,
+        "EOD",
+        model=model,
+        prompt_version=prompt_version,
+        max_workers=max_workers,
+        use_cache=use_cache,
+        label="authors"
+    )
+    return [
+        AuthorSummary(author, summary, len(commits_by_author[author]), cached)
+        for author, (summary, cached) in summaries.items()
+    ]
+
+
+def format_author_summaries(summaries: List[AuthorSummary]) -> str:
+    return "\n\n".join(f"## {summary.author}\n{summary.summary}" for summary in summaries)
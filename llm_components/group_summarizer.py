@@ -0,0 +1,53 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Tuple
+from llm_components.summary_cache import SummaryCache
+
+
+def summarize_groups(
+    groups: Dict[Hashable, Any],
+    build_inputs: Callable[[Hashable, Any], Dict],
+    generator: Callable[..., str],
+    summary_cache: SummaryCache,
+    kind: str,
+    model: str,
+    prompt_version: str,
+    max_workers: int = 2,
+    use_cache: bool = True,
+    label: str = "groups"
+) -> Dict[Hashable, Tuple[str, bool]]:
+    """
+    Summarize every group with one LLM call each, using the generator's
+    inputs from build_inputs(key, group). Summaries are cached under kind;
+    groups already in the cache are reused (unless use_cache is False) and the
+    rest are generated with at most max_workers LLM calls in flight.
+    Returns (summary, cached) per group key, in the order of groups.
+    """
+    summaries: Dict[Hashable, Tuple[str, bool]] = {}
+    pending = []
+    for group_key, group in groups.items():
+        inputs = build_inputs(group_key, group)
+        cache_key = SummaryCache.make_key(kind, inputs, model=model, prompt_version=prompt_version)
+        cached_summary = summary_cache.get(cache_key) if use_cache else None
+        if cached_summary is not None:
+            summaries[group_key] = (cached_summary, True)
+        else:
+            pending.append((group_key, cache_key, inputs))
+
+    def generate(item) -> Tuple[Hashable, str]:
+        group_key, cache_key, inputs = item
+        summary = generator(**inputs).strip()
+        summary_cache.put(cache_key, kind, summary)
+        return group_key, summary
+
+    started = time.perf_counter()
+    if pending:
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix=f"llm-{kind.lower()}") as executor:
+            for group_key, summary in executor.map(generate, pending):
+                summaries[group_key] = (summary, False)
+    logging.info(
+        f"Summarized {len(pending)} {label} in {time.perf_counter() - started:.2f}s, "
+        f"reused {len(summaries) - len(pending)} cached"
+    )
+    return {group_key: summaries[group_key] for group_key in groups}
@@ -0,0 +1,112 @@
+import math
+from typing import Callable, Dict, List, Optional, Tuple
+from git_components.commit_records import CommitRecord
+from llm_components.group_summarizer import summarize_groups
+from llm_components.prompt_builder import PromptBuildResult, build_commit_prompt, estimate_tokens
+from llm_components.summary_cache import SummaryCache
+
+# Lines kept per repository-day summary, tried in order until the reduce input fits the budget
+SUMMARY_LINE_LIMITS = (6, 3, 1)
+
+
+class RepoDaySummary:
+    """Summary of the commits one repository received on one day"""
+    __slots__ = ("repo", "date", "summary", "cached")
+
+    def __init__(self, repo: str, date: str, summary: str, cached: bool):
+        self.repo = repo
+        self.date = date
+        self.summary = summary
+        self.cached = cached
+
+
+def group_by_repo_day(records: List[CommitRecord]) -> Dict[Tuple[str, str], List[CommitRecord]]:
+    groups: Dict[Tuple[str, str], List[CommitRecord]] = {}
+    for record in records:
+        groups.setdefault((record.repo, record.date), []).append(record)
+    return dict(sorted(groups.items(), key=lambda item: (item[0][1], item[0][0])))
+
+
+def summarize_repo_days(
+    records: List[CommitRecord],
+    generator: Callable[..., str],
+    summary_cache: SummaryCache,
+    model: str,
+    prompt_version: str,
+    token_budget: int,
+    max_workers: int = 2,
+    use_cache: bool = True
+) -> List[RepoDaySummary]:
+    """
+    Map step of a hierarchical summary: summarize every repository/day group.
+    Groups already in the summary cache are reused, and the rest are
+    generated concurrently with at most max_workers LLM calls in flight.
+    """
+    summaries = summarize_groups(
+        group_by_repo_day(records),
+        lambda repo_day, group: {
+            "repo": repo_day[0],
+            "date": repo_day[1],
+            "collected_commits": build_commit_prompt(group, token_budget).text
+        },
+        generator,
+        summary_cache,
+        "REPO_DAY",
+        model=model,
+        prompt_version=prompt_version,
+        max_workers=max_workers,
+        use_cache=use_cache,
+        label="repository-days"
+    )
+    return [RepoDaySummary(repo, date, summary, cached) for (repo, date), (summary, cached) in summaries.items()]
+
+
+def summary_lines(summary: RepoDaySummary) -> List[str]:
+    return [line for line in summary.summary.splitlines() if line.strip()]
+
+
+def format_repo_day_summaries(summaries: List[RepoDaySummary], max_lines: Optional[int] = None) -> str:
+    """Render map-step summaries as the input of the reduce step, optionally keeping max_lines per summary"""
+    lines = []
+    for summary in summaries:
+        lines.append(f"Date: {summary.date} | Repository: {summary.repo}")
+        lines.extend(f"  {line}" for line in summary_lines(summary)[:max_lines])
+    return "\n".join(lines) if lines else "No commits found."
+
+
+def build_reduce_prompt(
+    summaries: List[RepoDaySummary],
+    token_budget: int,
+    count_tokens: Callable[[str], int] = estimate_tokens
+) -> PromptBuildResult:
+    """
+    Fit the map-step summaries into token_budget for the reduce step. Each
+    summary is cut to fewer lines step by step, and if one line per summary is
+    still too much the earliest repository-days are left out.
+    """
+    text = format_repo_day_summaries(summaries)
+    original_tokens = count_tokens(text)
+    max_lines = None
+    for limit in SUMMARY_LINE_LIMITS:
+        if count_tokens(text) <= token_budget:
+            break
+        max_lines = limit
+        text = format_repo_day_summaries(summaries, max_lines)
+
+    def render(kept: List[RepoDaySummary]) -> str:
+        omitted = len(summaries) - len(kept)
+        note = f"(+{omitted} earlier repository-days omitted to fit the prompt budget)\n" if omitted else ""
+        return note + format_repo_day_summaries(kept, max_lines)
+
+    # Summaries are ordered by date, so the earliest days are at the front
+    kept = summaries
+    while count_tokens(text) > token_budget and len(kept) > 1:
+        tokens = count_tokens(text)
+        per_summary = tokens / len(kept)
+        kept = kept[max(1, min(len(kept) - 1, math.ceil((tokens - token_budget) / per_summary))):]
+        text = render(kept)
+    dropped = {
+        "summary lines": sum(len(summary_lines(summary)[max_lines:]) for summary in kept) if max_lines else 0,
+        "earlier repository-days": len(summaries) - len(kept)
+    }
+    return PromptBuildResult(text, count_tokens(text), original_tokens, [], dropped)
@@ -1,15 +1,16 @@
 import os
 import logging
-from typing import Optional
+import time
+from functools import lru_cache
+from typing import Dict, Iterator, Optional
 from dotenv import load_dotenv
-from langchain_core.messages import HumanMessage, SystemMessage
-from langchain_core.prompts import (
-    ChatPromptTemplate,
-    HumanMessagePromptTemplate,
-    MessagesPlaceholder,
-    SystemMessagePromptTemplate,
+from llm_components.prompt_builder import estimate_tokens
+from metrics_components.metrics import (
+    llm_generation_seconds,
+    llm_requests,
+    llm_tokens_per_second,
+    llm_ttft_seconds,
 )
-from langchain_community.llms import Ollama
 
 load_dotenv()
 
@@ -18,13 +19,59 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 
 # Define the Ollama model using an environment variable
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "deepseek-r1:1.5b")
+OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 
+# How long Ollama keeps the model loaded after a request (e.g. "30m", "-1" to pin it)
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+
+# Load the model into Ollama when the server starts
+OLLAMA_WARMUP = os.getenv("OLLAMA_WARMUP", "true").lower() in ("1", "true", "yes")
+
+# Bump whenever the prompts change so cached summaries are not reused across prompt versions
+PROMPT_VERSION = "1"
+
+# Token budget for the commit section of a prompt
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "6000"))
+
+# Maximum number of concurrent LLM calls for map/reduce and per-ticket summaries
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "2"))
+
+# Sprint review strategy: "ticket" summarizes the commits linked to each requested ticket separately,
+# "single" sends the commits in one call and "hierarchical" summarizes each repository per day first
+# and reduces those summaries into the review. Every mode only uses commits linked to the tickets.
+SPRINT_REVIEW_MODE = os.getenv("SPRINT_REVIEW_MODE", "ticket").lower()
+
+# Summary cache settings
+SUMMARY_CACHE_ENABLED = os.getenv("SUMMARY_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+SUMMARY_CACHE_FILE = os.getenv("SUMMARY_CACHE_FILE", "data/.summary_cache.db")
+SUMMARY_CACHE_TTL_HOURS = float(os.getenv("SUMMARY_CACHE_TTL_HOURS", "168"))
+SUMMARY_CACHE_MAX_ENTRIES = int(os.getenv("SUMMARY_CACHE_MAX_ENTRIES", "500"))
+
+# Stream tokens to the client as they are generated unless disabled
+LLM_STREAMING = os.getenv("LLM_STREAMING", "true").lower() in ("1", "true", "yes")
+
+def parse_keep_alive(value: str):
+    """Ollama accepts durations like "30m" or a number of seconds, where -1 keeps the model loaded"""
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+@lru_cache(maxsize=None)
 def ollama_llm():
     """
-    Initialize Ollama LLM
+    Initialize the shared Ollama LLM.
+    The client keeps its HTTP connection pool open, so it is created once and reused.
+    langchain is imported here rather than at module load so the web server starts without it.
     """
     try:
-        llm = Ollama(model=OLLAMA_MODEL)
+        from langchain_ollama import OllamaLLM
+
+        llm = OllamaLLM(
+            model=OLLAMA_MODEL,
+            base_url=OLLAMA_BASE_URL,
+            keep_alive=parse_keep_alive(OLLAMA_KEEP_ALIVE)
+        )
         logging.info(f"Ollama LLM initialized with model: {OLLAMA_MODEL}")
         return llm
     except Exception as e:
@@ -32,61 +79,207 @@ def ollama_llm():
         raise
 
 
-def llm_eod_summary_generator(collected_commits: str) -> str:
+def build_chain(system: str, human: str):
     """
-    Generates an end-of-day summary using Ollama.
+    Build a system + human prompt chain on the shared Ollama client.
+    langchain is imported here rather than at module level to keep startup fast.
     """
-    logging.info("Starting end-of-day summary generation")
-    llm = ollama_llm()
+    from langchain_core.prompts import (
+        ChatPromptTemplate,
+        HumanMessagePromptTemplate,
+        SystemMessagePromptTemplate,
+    )
 
-    # Define the prompt template with a system message
     prompt = ChatPromptTemplate.from_messages([
-        SystemMessagePromptTemplate.from_template(
-            "You are a helpful assistant that summarizes git commits for end-of-day reports. Be concise and informative."
-        ),
-        HumanMessagePromptTemplate.from_template(
-            "Here are the collected commits: {collected_commits}"
-        ),
+        SystemMessagePromptTemplate.from_template(system),
+        HumanMessagePromptTemplate.from_template(human),
     ])
+    return prompt | ollama_llm()
+
+
+@lru_cache(maxsize=None)
+def eod_chain():
+    """
+    Build the end-of-day prompt chain once and share it across requests.
+    """
+    return build_chain(
+        "You are a helpful assistant that summarizes git commits for end-of-day reports. Be concise and informative.",
+        "Here are the collected commits: {collected_commits}"
+    )
 
-    # Create the chain
-    chain = prompt | llm
+
+@lru_cache(maxsize=None)
+def sprint_review_chain():
+    """
+    Build the sprint review prompt chain once and share it across requests.
+    """
+    return build_chain(
+        "You are a helpful assistant that summarizes git commits and tickets for sprint review reports. Be concise and informative.",
+        "Here are the collected commits: {collected_commits}. Here are the tickets: {tickets}"
+    )
+
+
+@lru_cache(maxsize=None)
+def repo_day_chain():
+    """
+    Build the per-repository daily summary chain used by hierarchical sprint reviews.
+    """
+    return build_chain(
+        "You are a helpful assistant that summarizes one day of git commits in one repository. "
+        "Reply with a few short bullet points describing the work done, grouped by branch. Be concise and informative.",
+        "Repository: {repo}\nDate: {date}\nHere are the collected commits: {collected_commits}"
+    )
+
+
+def warm_up_llm() -> None:
+    """
+    Load the model into Ollama memory ahead of the first request.
+    An empty prompt makes Ollama load the model and apply keep_alive without generating anything.
+    """
+    started = time.perf_counter()
+    try:
+        ollama_llm()._client.generate(
+            model=OLLAMA_MODEL,
+            prompt="",
+            keep_alive=parse_keep_alive(OLLAMA_KEEP_ALIVE)
+        )
+        eod_chain()
+        sprint_review_chain()
+        logging.info(f"Warmed up Ollama model {OLLAMA_MODEL} in {time.perf_counter() - started:.2f}s")
+    except Exception as e:
+        logging.warning(f"Could not warm up Ollama model {OLLAMA_MODEL}: {e}")
+
+
+def record_generation(kind: str, started: float, output: str, first_token_at: Optional[float] = None) -> None:
+    """
+    Record a successful generation in the LLM metrics. Without a first token
+    time (blocking calls) the token rate covers the whole request.
+    """
+    finished = time.perf_counter()
+    llm_requests.inc(kind=kind, outcome="success")
+    llm_generation_seconds.observe(finished - started, kind=kind)
+    if first_token_at is not None:
+        llm_ttft_seconds.observe(first_token_at - started, kind=kind)
+    generating_since = first_token_at if first_token_at is not None else started
+    if finished > generating_since:
+        llm_tokens_per_second.observe(estimate_tokens(output) / (finished - generating_since), kind=kind)
+
+
+def llm_eod_summary_generator(collected_commits: str) -> str:
+    """
+    Generates an end-of-day summary using Ollama.
+    """
+    logging.info("Starting end-of-day summary generation")
+    chain = eod_chain()
 
     try:
         logging.info("Sending request to LLM")
+        started = time.perf_counter()
         response = chain.invoke({"collected_commits": collected_commits})
+        record_generation("EOD", started, response)
         logging.info(f"Generated summary: {response}")  # Log the generated summary
         return response
     except Exception as e:
+        llm_requests.inc(kind="EOD", outcome="error")
         logging.error(f"Error generating summary: {e}")
         raise Exception(f"Due to {e} we could not generate the summary")
 
 
+def llm_repo_day_summary_generator(repo: str, date: str, collected_commits: str) -> str:
+    """
+    Generates the summary of one repository's commits on one day using Ollama.
+    """
+    logging.info(f"Starting daily summary generation for {repo} on {date}")
+    chain = repo_day_chain()
+
+    try:
+        started = time.perf_counter()
+        response = chain.invoke({"repo": repo, "date": date, "collected_commits": collected_commits})
+        record_generation("REPO_DAY", started, response)
+        return response
+    except Exception as e:
+        llm_requests.inc(kind="REPO_DAY", outcome="error")
+        logging.error(f"Error generating daily summary for {repo} on {date}: {e}")
+        raise Exception(f"Due to {e} we could not generate the daily summary for {repo} on {date}")
+
+
 def llm_sprint_review_summary_generator(collected_commits: str, tickets: str) -> str:
     """
     Generates a sprint review summary using Ollama.
     """
     logging.info("Starting sprint review summary generation")
-    llm = ollama_llm()
-
-    # Define the prompt template with a system message
-    prompt = ChatPromptTemplate.from_messages([
-        SystemMessagePromptTemplate.from_template(
-            "You are a helpful assistant that summarizes git commits and tickets for sprint review reports. Be concise and informative."
-        ),
-        HumanMessagePromptTemplate.from_template(
-            "Here are the collected commits: {collected_commits}. Here are the tickets: {tickets}"
-        ),
-    ])
-
-    # Create the chain
-    chain = prompt | llm
+    chain = sprint_review_chain()
 
     try:
         logging.info("Sending request to LLM")
+        started = time.perf_counter()
         response = chain.invoke({"collected_commits": collected_commits, "tickets": tickets})
+        record_generation("SPRINT_REVIEW", started, response)
         logging.info(f"Generated summary: {response}")  # Log the generated summary
         return response
+    except Exception as e:
+        llm_requests.inc(kind="SPRINT_REVIEW", outcome="error")
+        logging.error(f"Error generating sprint review summary: {e}")
+        raise Exception(f"Due to {e} we could not generate the sprint review summary")
+
+
+def stream_chain(chain, inputs: Dict, label: str, kind: str) -> Iterator[str]:
+    """
+    Streams text chunks from a prompt chain, logging and recording time-to-first-token and throughput.
+    """
+    logging.info(f"Streaming {label} from LLM")
+    started = time.perf_counter()
+    first_token_at = None
+    chunks = []
+    try:
+        for chunk in chain.stream(inputs):
+            if not chunk:
+                continue
+            if first_token_at is None:
+                first_token_at = time.perf_counter()
+                logging.info(f"Time to first token for {label}: {first_token_at - started:.2f}s")
+            chunks.append(chunk)
+            yield chunk
+    except Exception:
+        llm_requests.inc(kind=kind, outcome="error")
+        raise
+    record_generation(kind, started, "".join(chunks), first_token_at)
+    chunk_count = len(chunks)
+    finished_at = time.perf_counter()
+    generation_time = finished_at - first_token_at if first_token_at else 0.0
+    rate = chunk_count / generation_time if generation_time > 0 else 0.0
+    logging.info(
+        f"Streamed {chunk_count} chunks for {label} in {finished_at - started:.2f}s "
+        f"({rate:.1f} chunks/s after first token)"
+    )
+
+
+def llm_eod_summary_stream(collected_commits: str) -> Iterator[str]:
+    """
+    Streams an end-of-day summary from Ollama chunk by chunk.
+    """
+    logging.info("Starting streamed end-of-day summary generation")
+    chain = eod_chain()
+
+    try:
+        yield from stream_chain(chain, {"collected_commits": collected_commits}, "end-of-day summary", "EOD")
+    except Exception as e:
+        logging.error(f"Error generating summary: {e}")
+        raise Exception(f"Due to {e} we could not generate the summary")
+
+
+def llm_sprint_review_summary_stream(collected_commits: str, tickets: str) -> Iterator[str]:
+    """
+    Streams a sprint review summary from Ollama chunk by chunk.
+    """
+    logging.info("Starting streamed sprint review summary generation")
+    chain = sprint_review_chain()
+
+    try:
+        yield from stream_chain(
+            chain, {"collected_commits": collected_commits, "tickets": tickets}, "sprint review summary",
+            "SPRINT_REVIEW"
+        )
     except Exception as e:
         logging.error(f"Error generating sprint review summary: {e}")
-        raise Exception(f"Due to {e} we could not generate the sprint review summary")
\ No newline at end of file
+        raise Exception(f"Due to {e} we could not generate the sprint review summary")
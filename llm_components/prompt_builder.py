@@ -0,0 +1,141 @@
+import logging
+import math
+import re
+from typing import Callable, Dict, List
+from git_components.commit_records import CommitRecord, format_commits
+
+REVERT_SUBJECT = re.compile(r'^Revert "(?P<subject>.+)"$')
+REVERTED_SHA = re.compile(r"This reverts commit (?P<sha>[0-9a-f]{7,40})")
+
+# Body lengths tried from most to least detailed until the prompt fits the budget
+BODY_LIMITS = (600, 300, 120, 0)
+# Shares of the oldest commits whose bodies are shortened to the next limit, one step at a time
+BODY_SHORTENING_SHARES = (0.25, 0.5, 0.75, 1.0)
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count; local models average about four characters per token"""
+    return math.ceil(len(text) / 4)
+
+
+class PromptBuildResult:
+    """Compacted commit text plus the accounting of what was removed"""
+    __slots__ = ("text", "tokens", "original_tokens", "records", "dropped")
+
+    def __init__(
+        self,
+        text: str,
+        tokens: int,
+        original_tokens: int,
+        records: List[CommitRecord],
+        dropped: Dict[str, int]
+    ):
+        self.text = text
+        self.tokens = tokens
+        self.original_tokens = original_tokens
+        self.records = records
+        self.dropped = dropped
+
+    @property
+    def saved_tokens(self) -> int:
+        return max(0, self.original_tokens - self.tokens)
+
+    def describe(self) -> str:
+        dropped = ", ".join(f"{count} {reason}" for reason, count in self.dropped.items() if count)
+        return (
+            f"Prompt uses {self.tokens} tokens (saved {self.saved_tokens} of {self.original_tokens})"
+            + (f"; dropped {dropped}" if dropped else "")
+        )
+
+
+def drop_merges(records: List[CommitRecord]) -> List[CommitRecord]:
+    return [record for record in records if not record.is_merge and not record.subject.startswith("Merge ")]
+
+
+def drop_reverted_pairs(records: List[CommitRecord]) -> List[CommitRecord]:
+    """Remove reverts together with the commits they revert when both are present"""
+    by_sha = {record.sha: record for record in records}
+    by_subject = {(record.repo, record.subject): record for record in records}
+    removed = set()
+    for record in records:
+        match = REVERT_SUBJECT.match(record.subject)
+        if not match:
+            continue
+        target = None
+        sha_match = REVERTED_SHA.search(record.body)
+        if sha_match:
+            target = next(
+                (candidate for sha, candidate in by_sha.items() if sha.startswith(sha_match.group("sha"))),
+                None
+            )
+        if target is None:
+            target = by_subject.get((record.repo, match.group("subject")))
+        if target is not None and target.sha not in removed:
+            removed.update((record.sha, target.sha))
+    return [record for record in records if record.sha not in removed]
+
+
+def collapse_repeated_subjects(records: List[CommitRecord]) -> List[CommitRecord]:
+    """Keep the first commit of every repeated subject in a repository, as produced by rebases and cherry-picks"""
+    seen = set()
+    collapsed = []
+    for record in records:
+        key = (record.repo, record.subject.strip().lower())
+        if key in seen:
+            continue
+        seen.add(key)
+        collapsed.append(record)
+    return collapsed
+
+
+def build_commit_prompt(
+    records: List[CommitRecord],
+    token_budget: int,
+    count_tokens: Callable[[str], int] = estimate_tokens
+) -> PromptBuildResult:
+    """
+    Compact commit records into prompt text that fits token_budget.
+
+    Noise is removed first (merge commits, revert pairs, repeated subjects).
+    Commit bodies are then shortened step by step, oldest commits first, and
+    if the subjects alone still exceed the budget the oldest commits are left out.
+    """
+    original_tokens = count_tokens(format_commits(records, {record.sha: 10 ** 6 for record in records}))
+
+    without_merges = drop_merges(records)
+    without_reverts = drop_reverted_pairs(without_merges)
+    compacted = collapse_repeated_subjects(without_reverts)
+    dropped = {
+        "merge commits": len(records) - len(without_merges),
+        "reverted commits": len(without_merges) - len(without_reverts),
+        "repeated subjects": len(without_reverts) - len(compacted),
+        "older commits": 0
+    }
+
+    # Each step lowers the body limit of a growing share of the oldest commits,
+    # so newer commits keep their bodies the longest
+    newest_first = sorted(compacted, key=lambda record: record.date, reverse=True)
+    body_limits = {record.sha: BODY_LIMITS[0] for record in newest_first}
+    text = format_commits(compacted, body_limits)
+    steps = [(limit, share) for limit in BODY_LIMITS[1:] for share in BODY_SHORTENING_SHARES]
+    for limit, share in steps:
+        if count_tokens(text) <= token_budget:
+            break
+        oldest = newest_first[len(newest_first) - math.ceil(len(newest_first) * share):]
+        for record in oldest:
+            body_limits[record.sha] = min(body_limits[record.sha], limit)
+        text = format_commits(compacted, body_limits)
+
+    kept = newest_first
+    while count_tokens(text) > token_budget and len(kept) > 1:
+        overflow = count_tokens(text) - token_budget
+        kept = kept[:-max(1, min(len(kept) - 1, overflow // 20))]
+        text = format_commits(kept)
+    dropped["older commits"] = len(newest_first) - len(kept)
+    if dropped["older commits"]:
+        text += f"\n(+{dropped['older commits']} older commits omitted to fit the prompt budget)"
+
+    result = PromptBuildResult(text, count_tokens(text), original_tokens, kept, dropped)
+    logging.info(result.describe())
+    return result
+
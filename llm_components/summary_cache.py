@@ -0,0 +1,113 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS summaries (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_summaries_last_access ON summaries (last_access);
+"""
+
+
+class SummaryCache:
+    """
+    Content-addressed cache of generated summaries.
+
+    Keys are a hash of everything that influences the generation (the kind of
+    summary, the prompt inputs, the model and the prompt version), so identical
+    requests share one entry. Entries expire after ttl_seconds and the least
+    recently used entries are evicted once max_entries is exceeded.
+    """
+
+    def __init__(self, db_file: str, ttl_seconds: float, max_entries: int, enabled: bool = True):
+        self.db_file = db_file
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.enabled = enabled
+        # The database is created on first use so importing the app stays cheap
+        self._ready = False
+        self._ready_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._ready:
+            with self._ready_lock:
+                if not self._ready:
+                    os.makedirs(os.path.dirname(self.db_file) or ".", exist_ok=True)
+                    with self._open() as conn:
+                        conn.executescript(SCHEMA)
+                    self._ready = True
+        return self._open()
+
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_file, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    @staticmethod
+    def make_key(kind: str, inputs: Dict, model: str, prompt_version: str) -> str:
+        """Hash the generation inputs into a cache key"""
+        payload = json.dumps(
+            {"kind": kind, "inputs": inputs, "model": model, "prompt_version": prompt_version},
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response for key, or None when missing or expired"""
+        if not self.enabled:
+            return None
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT response, created_at FROM summaries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            response, created_at = row
+            if now - created_at > self.ttl_seconds:
+                conn.execute("DELETE FROM summaries WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE summaries SET last_access = ? WHERE key = ?", (now, key))
+        logging.info(f"Summary cache hit for {key[:12]}")
+        return response
+
+    def put(self, key: str, kind: str, response: str) -> None:
+        """Store a response and evict expired or least recently used entries"""
+        if not self.enabled:
+            return
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?, ?)",
+                    (key, kind, response, now, now)
+                )
+                conn.execute("DELETE FROM summaries WHERE created_at < ?", (now - self.ttl_seconds,))
+                conn.execute(
+                    """
+                    DELETE FROM summaries WHERE key IN (
+                        SELECT key FROM summaries ORDER BY last_access DESC LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self.max_entries,)
+                )
+        except sqlite3.Error as e:
+            logging.warning(f"Could not store summary in cache: {e}")
+
+    def clear(self) -> None:
+        """Remove every cached summary"""
+        if not self.enabled:
+            return
+        with self._connect() as conn:
+            conn.execute("DELETE FROM summaries")
@@ -0,0 +1,62 @@
+from typing import Callable, Dict, List
+from git_components.commit_records import CommitRecord
+from llm_components.group_summarizer import summarize_groups
+from llm_components.prompt_builder import build_commit_prompt
+from llm_components.summary_cache import SummaryCache
+
+
+class TicketSummary:
+    """Sprint review section for one ticket"""
+    __slots__ = ("ticket", "summary", "commit_count", "cached")
+
+    def __init__(self, ticket: str, summary: str, commit_count: int, cached: bool):
+        self.ticket = ticket
+        self.summary = summary
+        self.commit_count = commit_count
+        self.cached = cached
+
+
+def summarize_tickets(
+    commits_by_ticket: Dict[str, List[CommitRecord]],
+    generator: Callable[..., str],
+    summary_cache: SummaryCache,
+    model: str,
+    prompt_version: str,
+    token_budget: int,
+    max_workers: int = 2,
+    use_cache: bool = True
+) -> List[TicketSummary]:
+    """
+    Summarize the commits linked to each ticket separately, with at most
+    max_workers LLM calls in flight. Sections are cached per ticket and
+    returned in the order the tickets were requested.
+    """
+    summaries = summarize_groups(
+        {ticket: records for ticket, records in commits_by_ticket.items() if records},
+        lambda ticket, records: {
+            "collected_commits": build_commit_prompt(records, token_budget).text,
+            "tickets": [ticket]
+        },
+        generator,
+        summary_cache,
+        "SPRINT_REVIEW",
+        model=model,
+        prompt_version=prompt_version,
+        max_workers=max_workers,
+        use_cache=use_cache,
+        label="tickets"
+    )
+    results = []
+    for ticket, records in commits_by_ticket.items():
+        if ticket in summaries:
+            summary, cached = summaries[ticket]
+            results.append(TicketSummary(ticket, summary, len(records), cached))
+        else:
+            results.append(TicketSummary(
+                ticket, f"- Ticket ID: {ticket}\n- Summary: No commits found for this ticket.", 0, cached=False
+            ))
+    return results
+
+
+def format_ticket_summaries(summaries: List[TicketSummary]) -> str:
+    return "\n\n".join(summary.summary for summary in summaries)
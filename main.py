@@ -1,3 +1,7 @@
+import time
+# Measured from here so the startup report covers every import below
+started_at = time.perf_counter()
+
 import logging
 import sys
 import os
@@ -6,13 +10,58 @@ from flask_cors import CORS
 import json
 import traceback
 import signal
+import threading
+from typing import Optional
+from environment.constants import (
+    eod_precompute_max_age_minutes,
+    author_aliases_file,
+    eod_schedule,
+    job_queue_depth,
+    job_retention_minutes,
+    job_workers,
+    server_drain_seconds,
+    server_mode,
+    server_port,
+)
+from git_components.author_aliases import canonical_author, load_author_aliases, partition_by_author
+from git_components.commit_records import deduplicate
 from git_components.git_service import GitLogFetcher
-from llm_components.llm_connector import llm_eod_summary_generator, llm_sprint_review_summary_generator
+from git_components.ticket_index import TicketIndex
+from llm_components.llm_connector import (
+    LLM_MAX_CONCURRENCY,
+    LLM_STREAMING,
+    OLLAMA_MODEL,
+    OLLAMA_WARMUP,
+    PROMPT_TOKEN_BUDGET,
+    PROMPT_VERSION,
+    SPRINT_REVIEW_MODE,
+    SUMMARY_CACHE_ENABLED,
+    SUMMARY_CACHE_FILE,
+    SUMMARY_CACHE_MAX_ENTRIES,
+    SUMMARY_CACHE_TTL_HOURS,
+    llm_eod_summary_generator,
+    llm_eod_summary_stream,
+    llm_repo_day_summary_generator,
+    llm_sprint_review_summary_generator,
+    llm_sprint_review_summary_stream,
+    warm_up_llm,
+)
+from llm_components.author_summarizer import format_author_summaries, summarize_authors
+from llm_components.hierarchical_summarizer import build_reduce_prompt, summarize_repo_days
+from llm_components.prompt_builder import build_commit_prompt
+from llm_components.ticket_summarizer import format_ticket_summaries, summarize_tickets
+from llm_components.summary_cache import SummaryCache
 from history_components.history_service import HistoryService, HistoryEntry
+from job_components.job_service import Job, JobQueueFull, JobService
+from job_components.scheduler import DailyScheduler, PrecomputedSummary, commit_fingerprint
+from metrics_components.metrics import StageSpan, pipeline_runs, prompt_tokens, registry, stage_span
+from web_components.assets import IMMUTABLE_CACHE_CONTROL, INDEX_CACHE_CONTROL, AssetStore
+from web_components.http_utils import asset_response, etag_matches, json_response, make_etag
+from web_components.server import AppServer
 import os
 
 app = Flask(__name__, static_folder='static', static_url_path='')
-CORS(app)
+CORS(app, expose_headers=['X-Job-Id'])
 
 logging.basicConfig(
     level=logging.INFO,
@@ -21,6 +70,22 @@ logging.basicConfig(
 
 git_log_fetcher: GitLogFetcher = GitLogFetcher()
 history_service: HistoryService = HistoryService()
+job_service: JobService = JobService(
+    max_workers=job_workers,
+    max_queue_depth=job_queue_depth,
+    retention_seconds=job_retention_minutes * 60
+)
+precomputed_eod: Optional[PrecomputedSummary] = None
+eod_scheduler: DailyScheduler = DailyScheduler(eod_schedule, lambda: pregenerate_eod(), name="EOD pre-generation")
+summary_cache: SummaryCache = SummaryCache(
+    SUMMARY_CACHE_FILE,
+    ttl_seconds=SUMMARY_CACHE_TTL_HOURS * 3600,
+    max_entries=SUMMARY_CACHE_MAX_ENTRIES,
+    enabled=SUMMARY_CACHE_ENABLED
+)
+asset_store: AssetStore = AssetStore(app.static_folder)
+app_server: AppServer = AppServer(app)
+startup_report = {"import_seconds": round(time.perf_counter() - started_at, 3)}
 
 def format_error(error):
     return {
@@ -28,57 +93,511 @@ def format_error(error):
         'traceback': traceback.format_exc()
     }
 
+def normalize_newlines(text: str) -> str:
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+def streaming_requested() -> bool:
+    """Streaming follows LLM_STREAMING unless the request overrides it with ?stream=0/1"""
+    value = request.args.get('stream')
+    if value is None:
+        return LLM_STREAMING
+    return value.lower() in ('1', 'true', 'yes')
+
+def cache_requested(data=None) -> bool:
+    """The summary cache is used unless the request passes ?cache=0 or {"noCache": true}"""
+    if data and data.get('noCache'):
+        return False
+    return request.args.get('cache', '1').lower() not in ('0', 'false', 'no')
+
+def stream_response(chunks, collected: list):
+    """
+    Forwards LLM chunks inside the RESPONSE_START/RESPONSE_END framing and
+    collects them so the full response can be saved once the stream completes.
+    The framing is closed even if the stream fails part way through.
+    """
+    yield "RESPONSE_START\n"
+    try:
+        for chunk in chunks:
+            chunk = normalize_newlines(chunk)
+            collected.append(chunk)
+            yield chunk
+    except Exception:
+        yield "\nRESPONSE_END\n"
+        raise
+    yield "\nRESPONSE_END\n"
+
+def summarize(kind: str, generator, streamer, inputs: dict, stream: bool, use_cache: bool, result: dict):
+    """
+    Produces a summary for inputs, yielding progress lines and, when streaming,
+    the framed response. Identical inputs are served from the summary cache
+    unless use_cache is False; fresh summaries are always written back to it.
+    result receives the formatted response, whether it was cached and
+    whether it was already streamed to the client.
+    """
+    cache_key = SummaryCache.make_key(kind, inputs, model=OLLAMA_MODEL, prompt_version=PROMPT_VERSION)
+    cached_response = summary_cache.get(cache_key) if use_cache else None
+    if cached_response is not None:
+        yield "Using cached summary\n"
+        result.update(response=cached_response, cached=True, streamed=False)
+        return
+
+    if stream:
+        yield "Generating summary...\n"
+        chunks = []
+        yield from stream_response(streamer(**inputs), chunks)
+        response = "".join(chunks)
+    else:
+        response = generator(**inputs)
+    logging.info(f"Generated {kind} length: {len(response)}")
+    logging.info(f"{kind} preview: {response[:100]}...")
+
+    formatted_response = normalize_newlines(response.strip())
+    summary_cache.put(cache_key, kind, formatted_response)
+    result.update(response=formatted_response, cached=False, streamed=stream)
+
+def describe_collection(span: StageSpan, collection) -> None:
+    """Adds commit counts and the slowest repository to a collection stage's progress line"""
+    span.details.update(
+        commits=len(collection.records),
+        repos=len(collection.timings),
+        errors=len(collection.errors),
+        unchanged_repos=len(collection.skipped)
+    )
+    if collection.timings:
+        repo_path, elapsed = max(collection.timings.items(), key=lambda item: item[1])
+        span.details.update(
+            slowest_repo=os.path.basename(os.path.normpath(repo_path)),
+            slowest_repo_seconds=round(elapsed, 3)
+        )
+
 @app.route('/')
 def home():
-    return app.send_static_file('index.html')
+    return asset_response(asset_store.index(), INDEX_CACHE_CONTROL)
+
+@app.route('/assets/<name>')
+def serve_asset(name):
+    asset = asset_store.get(name)
+    if asset is None:
+        return jsonify({'error': 'Asset not found'}), 404
+    return asset_response(asset, IMMUTABLE_CACHE_CONTROL)
 
 @app.route('/images/<path:filename>')
 def serve_image(filename):
     return send_from_directory('static/images', filename)
 
-@app.route('/run-eod', methods=['POST'])
-def run_eod():
-    def generate():
+def eod_job_params(use_cache: bool, stream: bool) -> dict:
+    """Single-flight parameters of an EOD job, shared by /run-eod and the scheduled pre-generation"""
+    return {"days": 1, "use_cache": use_cache, "stream": stream}
+
+def remember_eod(eod_commits, response: str) -> None:
+    """Keep an EOD summary together with the commits it covers, to be served by /run-eod"""
+    global precomputed_eod
+    fingerprint = commit_fingerprint(record.sha for record in eod_commits.records)
+    precomputed_eod = PrecomputedSummary(response, fingerprint, time.time())
+
+def eod_error(job: Job, error: Exception, record_history: bool = True) -> str:
+    """Record a failed EOD run (in history unless record_history is False) and return the line reporting it"""
+    error_details = format_error(error)
+    logging.error(f"Error in run_eod: {error_details}")
+    job.error = str(error)
+    pipeline_runs.inc(pipeline="EOD", status="error")
+
+    if record_history:
+        # Save error to history
+        entry = HistoryEntry(
+            entry_type="EOD",
+            response=str(error),
+            status="error"
+        )
+        history_service.add_entry(entry)
+
+    return f"Error: {str(error)}\n"
+
+def eod_pipeline(stream: bool, use_cache: bool, eod_commits=None, record_history: bool = True):
+    """
+    Collects today's commits (unless eod_commits were already collected),
+    summarizes them and records the outcome in history unless record_history is False
+    """
+    def pipeline(job: Job):
         try:
             logging.info("Starting EOD Generator")
             yield "Starting EOD Generator...\n"
             
-            eod_logs = git_log_fetcher.get_git_logs(days=1)
-            yield "Git logs retrieved successfully\n"
+            collected = eod_commits
+            if collected is None:
+                with stage_span("EOD", "collect_logs") as span:
+                    collected = git_log_fetcher.get_commit_records(days=1)
+                    describe_collection(span, collected)
+                for repo_path, error in collected.errors.items():
+                    yield f"Skipped {repo_path}: {error.splitlines()[0] if error else 'unknown error'}\n"
+                yield f"Git logs retrieved successfully ({len(collected.records)} commits)\n"
+                yield span.progress_line()
+
+            with stage_span("EOD", "build_prompt") as span:
+                prompt = build_commit_prompt(collected.records, PROMPT_TOKEN_BUDGET)
+                span.details.update(tokens=prompt.tokens, original_tokens=prompt.original_tokens)
+            prompt_tokens.observe(prompt.tokens, pipeline="EOD")
+            yield f"{prompt.describe()}\n"
+            yield span.progress_line()
+            
+            result = {}
+            with stage_span("EOD", "generate") as span:
+                yield from summarize(
+                    "EOD",
+                    llm_eod_summary_generator,
+                    llm_eod_summary_stream,
+                    {"collected_commits": prompt.text},
+                    stream,
+                    use_cache,
+                    result
+                )
+                span.details["cached"] = result["cached"]
+            formatted_response = result["response"]
+            job.result = formatted_response
+            remember_eod(collected, formatted_response)
+            yield "Summary generated successfully\n"
+            yield span.progress_line()
+
+            if record_history:
+                # Save to history
+                entry = HistoryEntry(
+                    entry_type="EOD",
+                    response=formatted_response,
+                    status="passed",
+                    cached=result["cached"]
+                )
+                with stage_span("EOD", "history_write") as span:
+                    history_service.add_entry(entry)
+                yield "History updated\n"
+                yield span.progress_line()
+            pipeline_runs.inc(pipeline="EOD", status="passed")
+            
+            if not result["streamed"]:
+                yield f"RESPONSE_START\n{formatted_response}\nRESPONSE_END"
             
-            responses = llm_eod_summary_generator(collected_commits=eod_logs)
-            logging.info(f"Generated response length: {len(responses)}")
-            logging.info(f"Response preview: {responses[:100]}...")
+        except Exception as e:
+            yield eod_error(job, e, record_history)
+
+    return pipeline
+
+def precomputed_eod_pipeline(precomputed: PrecomputedSummary, stream: bool):
+    """
+    Serves a pre-generated EOD summary and records it in history, after checking
+    that today's commits still match the ones it was generated from; otherwise
+    the summary is generated live from the commits just collected.
+    """
+    def pipeline(job: Job):
+        try:
+            with stage_span("EOD", "collect_logs") as span:
+                eod_commits = git_log_fetcher.get_commit_records(days=1)
+                describe_collection(span, eod_commits)
+            if commit_fingerprint(record.sha for record in eod_commits.records) != precomputed.fingerprint:
+                yield "New commits since the pre-generated EOD summary, generating it again\n"
+                yield from eod_pipeline(stream, True, eod_commits)(job)
+                return
+            precomputed.checked_at = time.time()
+            generated_at = time.strftime('%H:%M', time.localtime(precomputed.generated_at))
+            yield f"Serving EOD summary pre-generated at {generated_at}\n"
+            job.result = precomputed.response
+            history_service.add_entry(HistoryEntry(
+                entry_type="EOD",
+                response=precomputed.response,
+                status="passed",
+                cached=True
+            ))
+            yield "History updated\n"
+            pipeline_runs.inc(pipeline="EOD", status="passed")
+            yield f"RESPONSE_START\n{precomputed.response}\nRESPONSE_END"
+        except Exception as e:
+            yield eod_error(job, e)
+
+    return pipeline
+
+def pregenerate_eod_pipeline(job: Job):
+    """
+    Generates today's EOD summary ahead of time without recording it in history,
+    unless the commits have not changed since the last pre-generated summary
+    """
+    try:
+        eod_commits = git_log_fetcher.get_commit_records(days=1)
+    except Exception as e:
+        yield eod_error(job, e, record_history=False)
+        return
+    previous = precomputed_eod
+    if previous is not None and previous.fingerprint == commit_fingerprint(
+        record.sha for record in eod_commits.records
+    ):
+        previous.checked_at = time.time()
+        logging.info("No new commits since the last pre-generated EOD, skipping")
+        job.result = previous.response
+        yield "No new commits since the pre-generated EOD summary\n"
+        yield f"RESPONSE_START\n{previous.response}\nRESPONSE_END"
+        return
+    yield from eod_pipeline(LLM_STREAMING, True, eod_commits, record_history=False)(job)
+
+def pregenerate_eod() -> None:
+    """
+    Scheduled task: generate today's EOD summary ahead of time. It runs as an
+    EOD job with the parameters of a default /run-eod, so a request arriving
+    meanwhile attaches to it (and the other way round) instead of calling the LLM twice.
+    """
+    job, created = job_service.submit("EOD", eod_job_params(True, LLM_STREAMING), pregenerate_eod_pipeline)
+    if not created:
+        logging.info(f"Waiting for the running EOD job {job.id} instead of pre-generating")
+    job.wait()
+    if job.error:
+        raise RuntimeError(job.error)
+
+def eod_batch_pipeline(authors: list, use_cache: bool):
+    """
+    Scans every repository once for all authors' commits, generates an EOD
+    summary per author and records them in history in a single write
+    """
+    def pipeline(job: Job):
+        try:
+            logging.info("Starting batch EOD Generator")
+            yield "Starting batch EOD Generator...\n"
+
+            with stage_span("EOD_BATCH", "collect_logs") as span:
+                eod_commits = git_log_fetcher.get_commit_records(days=1, all_authors=True)
+                describe_collection(span, eod_commits)
+            for repo_path, error in eod_commits.errors.items():
+                yield f"Skipped {repo_path}: {error.splitlines()[0] if error else 'unknown error'}\n"
+            yield f"Git logs retrieved successfully ({len(eod_commits.records)} commits)\n"
+            yield span.progress_line()
+
+            aliases = load_author_aliases(author_aliases_file)
+            commits_by_author = partition_by_author(eod_commits.records, aliases)
+            if authors:
+                wanted = [canonical_author(author, aliases) for author in authors]
+                commits_by_author = {author: commits_by_author.get(author, []) for author in wanted}
+                commits_by_author = {author: records for author, records in commits_by_author.items() if records}
+            yield f"Summarizing {len(commits_by_author)} author(s)...\n"
+
+            with stage_span("EOD_BATCH", "generate") as span:
+                author_summaries = summarize_authors(
+                    commits_by_author,
+                    llm_eod_summary_generator,
+                    summary_cache,
+                    model=OLLAMA_MODEL,
+                    prompt_version=PROMPT_VERSION,
+                    token_budget=PROMPT_TOKEN_BUDGET,
+                    max_workers=LLM_MAX_CONCURRENCY,
+                    use_cache=use_cache
+                )
+                span.details.update(
+                    authors=len(author_summaries),
+                    cached=sum(1 for summary in author_summaries if summary.cached)
+                )
+            formatted_response = normalize_newlines(format_author_summaries(author_summaries))
+            job.result = formatted_response
+            yield "Summaries generated successfully\n"
+            yield span.progress_line()
+
+            with stage_span("EOD_BATCH", "history_write") as span:
+                history_service.add_entries([
+                    HistoryEntry(
+                        entry_type="EOD",
+                        response=normalize_newlines(f"Author: {summary.author}\n\n{summary.summary}"),
+                        status="passed",
+                        cached=summary.cached
+                    )
+                    for summary in author_summaries
+                ])
+            yield "History updated\n"
+            yield span.progress_line()
+            pipeline_runs.inc(pipeline="EOD_BATCH", status="passed")
+            yield f"RESPONSE_START\n{formatted_response}\nRESPONSE_END"
+
+        except Exception as e:
+            error_details = format_error(e)
+            logging.error(f"Error in run_eod_batch: {error_details}")
+            job.error = str(e)
+            pipeline_runs.inc(pipeline="EOD_BATCH", status="error")
+            history_service.add_entry(HistoryEntry(
+                entry_type="EOD",
+                response=str(e),
+                status="error"
+            ))
+            yield f"Error: {str(e)}\n"
+
+    return pipeline
+
+def sprint_review_pipeline(
+    start_date: str,
+    end_date: str,
+    tickets: list,
+    mode: str,
+    stream: bool,
+    use_cache: bool
+):
+    """Collects commits in the date range, summarizes them with the tickets and records the outcome"""
+    def pipeline(job: Job):
+        try:
+            yield f"Fetching Git logs from {start_date} to {end_date}...\n"
             
-            formatted_response = responses.strip().replace('\r\n', '\n').replace('\r', '\n')
+            with stage_span("SPRINT_REVIEW", "collect_logs") as span:
+                sprint_review_commits = git_log_fetcher.get_commit_records_by_date_range(start_date, end_date)
+                describe_collection(span, sprint_review_commits)
+            for repo_path, error in sprint_review_commits.errors.items():
+                yield f"Skipped {repo_path}: {error.splitlines()[0] if error else 'unknown error'}\n"
+            yield f"Git logs retrieved successfully ({len(sprint_review_commits.records)} commits)\n"
+            yield span.progress_line()
+
+            records = sprint_review_commits.records
+            commits_by_ticket = TicketIndex(records).group_by_ticket(tickets)
+            linked = deduplicate(record for ticket_records in commits_by_ticket.values() for record in ticket_records)
+            mode_used = mode
+            if linked:
+                yield f"Linked {len(linked)} of {len(records)} commits to {len(commits_by_ticket)} ticket(s)\n"
+                records = linked
+            else:
+                if tickets:
+                    yield "No commits reference the requested tickets, summarizing all commits\n"
+                if mode == "ticket":
+                    mode_used = "single"
+
+            result = {}
+            with stage_span("SPRINT_REVIEW", "generate") as generate_span:
+                if mode_used == "ticket":
+                    yield f"Summarizing {len(commits_by_ticket)} ticket(s)...\n"
+                    ticket_summaries = summarize_tickets(
+                        commits_by_ticket,
+                        llm_sprint_review_summary_generator,
+                        summary_cache,
+                        model=OLLAMA_MODEL,
+                        prompt_version=PROMPT_VERSION,
+                        token_budget=PROMPT_TOKEN_BUDGET,
+                        max_workers=LLM_MAX_CONCURRENCY,
+                        use_cache=use_cache
+                    )
+                    result.update(
+                        response=normalize_newlines(format_ticket_summaries(ticket_summaries)),
+                        cached=all(summary.cached for summary in ticket_summaries),
+                        streamed=False
+                    )
+                elif mode_used == "hierarchical":
+                    yield "Summarizing each repository per day...\n"
+                    repo_day_summaries = summarize_repo_days(
+                        records,
+                        llm_repo_day_summary_generator,
+                        summary_cache,
+                        model=OLLAMA_MODEL,
+                        prompt_version=PROMPT_VERSION,
+                        token_budget=PROMPT_TOKEN_BUDGET,
+                        max_workers=LLM_MAX_CONCURRENCY,
+                        use_cache=use_cache
+                    )
+                    reused = sum(1 for summary in repo_day_summaries if summary.cached)
+                    yield (
+                        f"Daily summaries ready ({len(repo_day_summaries)} repository-days, "
+                        f"{reused} reused from cache)\n"
+                    )
+                    with stage_span("SPRINT_REVIEW", "build_prompt") as span:
+                        prompt = build_reduce_prompt(repo_day_summaries, PROMPT_TOKEN_BUDGET)
+                        span.details.update(tokens=prompt.tokens, original_tokens=prompt.original_tokens)
+                    prompt_tokens.observe(prompt.tokens, pipeline="SPRINT_REVIEW")
+                    yield f"{prompt.describe()}\n"
+                    yield span.progress_line()
+                else:
+                    with stage_span("SPRINT_REVIEW", "build_prompt") as span:
+                        prompt = build_commit_prompt(records, PROMPT_TOKEN_BUDGET)
+                        span.details.update(tokens=prompt.tokens, original_tokens=prompt.original_tokens)
+                    prompt_tokens.observe(prompt.tokens, pipeline="SPRINT_REVIEW")
+                    yield f"{prompt.describe()}\n"
+                    yield span.progress_line()
+
+                if mode_used != "ticket":
+                    yield from summarize(
+                        "SPRINT_REVIEW",
+                        llm_sprint_review_summary_generator,
+                        llm_sprint_review_summary_stream,
+                        {
+                            "collected_commits": prompt.text,
+                            "tickets": tickets
+                        },
+                        stream,
+                        use_cache,
+                        result
+                    )
+                generate_span.details.update(mode=mode_used, cached=result["cached"])
+            formatted_summary = result["response"]
+            job.result = formatted_summary
             yield "Summary generated successfully\n"
+            yield generate_span.progress_line()
 
             # Save to history
             entry = HistoryEntry(
-                entry_type="EOD",
-                response=formatted_response,
-                status="passed"
+                entry_type="SPRINT_REVIEW",
+                response=formatted_summary,
+                status="passed",
+                cached=result["cached"]
             )
-            history_service.add_entry(entry)
+            with stage_span("SPRINT_REVIEW", "history_write") as span:
+                history_service.add_entry(entry)
             yield "History updated\n"
+            yield span.progress_line()
+            pipeline_runs.inc(pipeline="SPRINT_REVIEW", status="passed")
             
-            yield f"RESPONSE_START\n{formatted_response}\nRESPONSE_END"
+            if not result["streamed"]:
+                yield f"RESPONSE_START\n{formatted_summary}\nRESPONSE_END"
             
         except Exception as e:
             error_details = format_error(e)
-            logging.error(f"Error in run_eod: {error_details}")
+            logging.error(f"Error in run_sprint_review: {error_details}")
+            job.error = str(e)
+            pipeline_runs.inc(pipeline="SPRINT_REVIEW", status="error")
             
             # Save error to history
             entry = HistoryEntry(
-                entry_type="EOD",
+                entry_type="SPRINT_REVIEW",
                 response=str(e),
                 status="error"
             )
             history_service.add_entry(entry)
             
             yield f"Error: {str(e)}\n"
-    
-    return Response(generate(), mimetype='text/event-stream')
+
+    return pipeline
+
+def job_stream_response(job: Job, start: int = 0) -> Response:
+    """Stream a job's progress as server-sent events; the job keeps running if the client disconnects"""
+    response = Response(job.iter_events(start), mimetype='text/event-stream')
+    response.headers['X-Job-Id'] = job.id
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.route('/run-eod', methods=['POST'])
+def run_eod():
+    try:
+        stream = streaming_requested()
+        use_cache = cache_requested()
+        precomputed = precomputed_eod
+        if use_cache and precomputed is not None and precomputed.is_fresh(eod_precompute_max_age_minutes * 60):
+            pipeline = precomputed_eod_pipeline(precomputed, stream)
+        else:
+            pipeline = eod_pipeline(stream, use_cache)
+        job, _ = job_service.submit("EOD", eod_job_params(use_cache, stream), pipeline)
+        return job_stream_response(job)
+    except JobQueueFull as e:
+        return jsonify({'error': str(e)}), 503
+
+@app.route('/run-eod-batch', methods=['POST'])
+def run_eod_batch():
+    try:
+        data = request.get_json(silent=True) or {}
+        authors = data.get('authors', [])
+        if not isinstance(authors, list):
+            return jsonify({'error': 'authors must be a list of emails'}), 400
+        use_cache = cache_requested(data)
+        job, _ = job_service.submit(
+            "EOD_BATCH",
+            {"days": 1, "authors": sorted(authors), "use_cache": use_cache},
+            eod_batch_pipeline(authors, use_cache)
+        )
+        return job_stream_response(job)
+    except JobQueueFull as e:
+        return jsonify({'error': str(e)}), 503
 
 @app.route('/run-sprint-review', methods=['POST'])
 def run_sprint_review():
@@ -94,76 +613,157 @@ def run_sprint_review():
         if not all([start_date, end_date]):
             return jsonify({'error': 'Missing required date parameters'}), 400
 
-        def generate():
-            try:
-                yield f"Fetching Git logs from {start_date} to {end_date}...\n"
-                
-                sprint_review_logs = git_log_fetcher.get_git_logs_by_date_range(start_date, end_date)
-                yield "Git logs retrieved successfully\n"
-                
-                summary = llm_sprint_review_summary_generator(
-                    collected_commits=sprint_review_logs,
-                    tickets=tickets
-                )
-                logging.info(f"Generated sprint review length: {len(summary)}")
-                logging.info(f"Sprint review preview: {summary[:100]}...")
-                
-                formatted_summary = summary.strip().replace('\r\n', '\n').replace('\r', '\n')
-                yield "Summary generated successfully\n"
+        if not isinstance(tickets, list) or not all(isinstance(ticket, str) and ticket.strip() for ticket in tickets):
+            return jsonify({'error': 'tickets must be a list of ticket ids'}), 400
 
-                # Save to history
-                entry = HistoryEntry(
-                    entry_type="SPRINT_REVIEW",
-                    response=formatted_summary,
-                    status="passed"
-                )
-                history_service.add_entry(entry)
-                yield "History updated\n"
-                
-                yield f"RESPONSE_START\n{formatted_summary}\nRESPONSE_END"
-                
-            except Exception as e:
-                error_details = format_error(e)
-                logging.error(f"Error in run_sprint_review: {error_details}")
-                
-                # Save error to history
-                entry = HistoryEntry(
-                    entry_type="SPRINT_REVIEW",
-                    response=str(e),
-                    status="error"
-                )
-                history_service.add_entry(entry)
-                
-                yield f"Error: {str(e)}\n"
-        
-        return Response(generate(), mimetype='text/event-stream')
+        mode = (data.get('mode') or SPRINT_REVIEW_MODE).lower()
+        if mode not in ('single', 'hierarchical', 'ticket'):
+            return jsonify({'error': f'Unknown sprint review mode: {mode}'}), 400
+
+        stream = streaming_requested()
+        use_cache = cache_requested(data)
+        job, _ = job_service.submit(
+            "SPRINT_REVIEW",
+            {
+                "start_date": start_date,
+                "end_date": end_date,
+                "tickets": tickets,
+                "mode": mode,
+                "use_cache": use_cache,
+                "stream": stream
+            },
+            sprint_review_pipeline(start_date, end_date, tickets, mode, stream, use_cache)
+        )
+        return job_stream_response(job)
+    except JobQueueFull as e:
+        return jsonify({'error': str(e)}), 503
     except Exception as e:
         error_details = format_error(e)
         logging.error(f"Error processing sprint review request: {error_details}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/jobs', methods=['GET'])
+def list_jobs():
+    return jsonify([job.to_dict() for job in job_service.list_jobs()])
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = job_service.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    include_events = request.args.get('events', '0').lower() in ('1', 'true', 'yes')
+    return jsonify(job.to_dict(include_events=include_events))
+
+@app.route('/jobs/<job_id>/stream', methods=['GET'])
+def stream_job(job_id):
+    job = job_service.get(job_id)
+    if not job:
+        return jsonify({'error': 'Job not found'}), 404
+    return job_stream_response(job, start=request.args.get('from', 0, type=int))
+
 @app.errorhandler(Exception)
 def handle_error(e):
     error_details = format_error(e)
     logging.error(f"Unhandled error: {error_details}")
     return jsonify({'error': str(e)}), 500
 
+@app.route('/ready', methods=['GET'])
+def ready():
+    """Readiness probe: answers once the server accepts requests, 503 while shutting down"""
+    if shutting_down.is_set():
+        return jsonify({'ready': False, 'reason': 'shutting down'}), 503
+    return jsonify({'ready': True, **startup_report})
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    return Response(registry.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/repos/refresh', methods=['POST'])
+def refresh_repos():
+    try:
+        repo_paths = git_log_fetcher.get_git_repo_paths(refresh=True)
+        return jsonify({'status': 'success', 'count': len(repo_paths), 'repos': repo_paths})
+    except Exception as e:
+        error_details = format_error(e)
+        logging.error(f"Error refreshing repository index: {error_details}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/history', methods=['GET'])
 def get_history():
+    """
+    Without a limit every full entry is returned as a list. With ?limit=N the
+    response is one page {"entries": [...], "next_cursor": ...}; pass
+    ?cursor=<next_cursor> for the following page and ?summary=1 to receive
+    a short preview instead of each full response.
+    """
     try:
-        entries = history_service.get_all_entries()
-        return jsonify([entry.to_dict() for entry in entries])
+        limit = request.args.get('limit', type=int)
+        cursor = request.args.get('cursor')
+        summary_only = request.args.get('summary', '0').lower() in ('1', 'true', 'yes')
+        etag = make_etag(history_service.get_revision(), limit, cursor, summary_only)
+        if etag_matches(etag):
+            return json_response(None, etag=etag)
+
+        if limit is None:
+            entries = history_service.get_all_entries()
+            return json_response([entry.to_dict() for entry in entries], etag=etag)
+
+        entries, next_cursor = history_service.list_entries(
+            limit=max(1, min(limit, 500)),
+            cursor=cursor,
+            include_response=not summary_only
+        )
+        return json_response({'entries': entries, 'next_cursor': next_cursor}, etag=etag)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         error_details = format_error(e)
         logging.error(f"Error retrieving history: {error_details}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/history/search', methods=['GET'])
+def search_history():
+    """
+    Full-text search over history responses: ?q=<words>, optionally filtered by
+    ?type=EOD|SPRINT_REVIEW, ?status=passed|error and ?from= / ?to= (YYYY-MM-DD,
+    inclusive). Results are ranked best first; page with ?limit= and ?offset=.
+    """
+    try:
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({'error': 'Missing search query'}), 400
+        limit = max(1, min(request.args.get('limit', 20, type=int), 100))
+        offset = max(0, request.args.get('offset', 0, type=int))
+        filters = {key: request.args.get(key) for key in ('type', 'status', 'from', 'to')}
+        etag = make_etag(history_service.get_revision(), query, limit, offset, *filters.values())
+        if etag_matches(etag):
+            return json_response(None, etag=etag)
+
+        results = history_service.search_entries(
+            query,
+            entry_type=filters['type'],
+            status=filters['status'],
+            date_from=filters['from'],
+            date_to=filters['to'],
+            limit=limit + 1,
+            offset=offset
+        )
+        next_offset = offset + limit if len(results) > limit else None
+        return json_response({'results': results[:limit], 'next_offset': next_offset}, etag=etag)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        error_details = format_error(e)
+        logging.error(f"Error searching history: {error_details}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/history/<entry_id>', methods=['GET'])
 def get_history_entry(entry_id):
     try:
         entry = history_service.get_entry_by_id(entry_id)
         if entry:
-            return jsonify(entry.to_dict())
+            entry_dict = entry.to_dict()
+            return json_response(entry_dict, etag=make_etag(*entry_dict.values()))
         return jsonify({'error': 'Entry not found'}), 404
     except Exception as e:
         error_details = format_error(e)
@@ -207,9 +807,42 @@ def terminate():
         logging.error(f"Error during termination: {error_details}")
         return jsonify({'error': str(e)}), 500
 
+shutting_down = threading.Event()
+
+def drain_jobs(timeout: float) -> bool:
+    """Wait up to timeout seconds for queued and running jobs to finish; returns whether they all did"""
+    deadline = time.monotonic() + timeout
+    while job_service.active_count() and time.monotonic() < deadline:
+        time.sleep(0.5)
+    drained = not job_service.active_count()
+    if not drained:
+        logging.warning(f"Abandoning {job_service.active_count()} unfinished job(s)")
+    job_service.shutdown(wait=False)
+    return drained
+
+def exit_now(status: int) -> None:
+    """
+    Exit without joining the job worker threads: sys.exit would wait for a
+    running job (and its LLM call) to finish before the process ends.
+    """
+    logging.shutdown()
+    os._exit(status)
+
+def shut_down() -> None:
+    """
+    Drain jobs while the server keeps answering requests (/ready with 503),
+    then stop it; exit at once when jobs are left unfinished.
+    """
+    if not drain_jobs(server_drain_seconds) or not app_server.stop():
+        exit_now(0)
+
 def signal_handler(signum, frame):
-    logging.info(f"Received signal {signum}. Shutting down...")
-    sys.exit(0)
+    if shutting_down.is_set():
+        logging.info(f"Received signal {signum} again. Exiting immediately...")
+        exit_now(1)
+    shutting_down.set()
+    logging.info(f"Received signal {signum}. Draining jobs and shutting down...")
+    threading.Thread(target=shut_down, name="shutdown", daemon=True).start()
 
 if __name__ == "__main__":
     # Register signal handlers
@@ -218,5 +851,18 @@ if __name__ == "__main__":
         signal.signal(signal.CTRL_C_EVENT, signal_handler)
     else:
         signal.signal(signal.SIGINT, signal_handler)
-    
-    app.run(debug=True, port=5001)
+
+    if OLLAMA_WARMUP:
+        threading.Thread(target=warm_up_llm, name="llm-warmup", daemon=True).start()
+    eod_scheduler.start()
+
+    startup_report["startup_seconds"] = round(time.perf_counter() - started_at, 3)
+    logging.info(
+        f"Started in {startup_report['startup_seconds']:.2f}s "
+        f"(imports and setup {startup_report['import_seconds']:.2f}s)"
+    )
+
+    if server_mode == "development":
+        app.run(debug=True, port=server_port, threaded=True)
+    else:
+        app_server.run()
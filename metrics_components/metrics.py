@@ -0,0 +1,188 @@
+import bisect
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Buckets in seconds, from a fast SQLite write to a slow LLM generation
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+TOKEN_BUCKETS = (250, 500, 1000, 2000, 4000, 6000, 8000, 16000, 32000)
+RATE_BUCKETS = (1, 2, 5, 10, 20, 30, 50, 75, 100, 200, 500)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonic counter, optionally split by labels"""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with sum and count, optionally split by labels"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.setdefault(key, [[0] * (len(self.buckets) + 1), 0.0, 0])
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((key, ([*counts], total, count)) for key, (counts, total, count) in self._series.items())
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, math.inf), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labels, key, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List = []
+
+    def counter(self, name: str, documentation: str, labels: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labels)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        metric = Histogram(name, documentation, labels, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+pipeline_runs = registry.counter(
+    "eod_pipeline_runs_total", "Generation pipelines finished, by pipeline and status", ("pipeline", "status")
+)
+stage_seconds = registry.histogram(
+    "eod_stage_duration_seconds", "Time spent in each pipeline stage", ("pipeline", "stage")
+)
+repo_collect_seconds = registry.histogram(
+    "eod_repo_collect_duration_seconds", "Time spent collecting one repository's commits", ("repo",)
+)
+repo_collect_errors = registry.counter(
+    "eod_repo_collect_errors_total", "Repositories whose commits could not be collected", ("repo",)
+)
+repo_collect_skipped = registry.counter(
+    "eod_repo_collect_skipped_total", "Repositories answered from change tracking without querying git", ("repo",)
+)
+prompt_tokens = registry.histogram(
+    "eod_prompt_tokens", "Estimated prompt size in tokens sent to the LLM", ("pipeline",), TOKEN_BUCKETS
+)
+llm_requests = registry.counter(
+    "eod_llm_requests_total", "LLM generations, by summary kind and outcome", ("kind", "outcome")
+)
+llm_ttft_seconds = registry.histogram(
+    "eod_llm_time_to_first_token_seconds", "Time until the LLM produced its first chunk", ("kind",)
+)
+llm_generation_seconds = registry.histogram(
+    "eod_llm_generation_duration_seconds", "Total LLM generation time", ("kind",)
+)
+llm_tokens_per_second = registry.histogram(
+    "eod_llm_tokens_per_second", "Estimated LLM output tokens per second after the first token", ("kind",),
+    RATE_BUCKETS
+)
+
+
+class StageSpan:
+    """Timing of one pipeline stage; details are included in its progress line"""
+    __slots__ = ("pipeline", "stage", "seconds", "details")
+
+    def __init__(self, pipeline: str, stage: str):
+        self.pipeline = pipeline
+        self.stage = stage
+        self.seconds = 0.0
+        self.details: Dict = {}
+
+    def progress_line(self) -> str:
+        """Structured line for the progress stream, e.g. STAGE {"stage": "collect", ...}"""
+        payload = {"pipeline": self.pipeline, "stage": self.stage, "seconds": round(self.seconds, 3), **self.details}
+        return f"STAGE {json.dumps(payload)}\n"
+
+
+@contextmanager
+def stage_span(pipeline: str, stage: str) -> Iterator[StageSpan]:
+    """Time a pipeline stage and record it in eod_stage_duration_seconds"""
+    span = StageSpan(pipeline, stage)
+    started = time.perf_counter()
+    try:
+        yield span
+    finally:
+        span.seconds = time.perf_counter() - started
+        stage_seconds.observe(span.seconds, pipeline=pipeline, stage=stage)
@@ -3,17 +3,32 @@
 # Activate virtual environment
 source .venv/bin/activate
 
+# Build the optimized static assets on first launch (WebP/AVIF variants need Pillow)
+if [ ! -f static/dist/manifest.json ]; then
+    python -m web_components.assets || echo "Asset build failed, serving unoptimized assets" >&2
+fi
+
 # Run Flask app in the background
 python main.py &
 
 # Save PID to kill later if needed
 APP_PID=$!
 
-# Wait a moment for the server to start
-sleep 2
+# Wait until the server reports ready (up to 30 seconds) instead of a fixed sleep
+PORT="${SERVER_PORT:-5001}"
+for _ in $(seq 1 300); do
+    if curl -sf "http://127.0.0.1:${PORT}/ready" > /dev/null 2>&1; then
+        break
+    fi
+    if ! kill -0 "$APP_PID" 2> /dev/null; then
+        echo "Server exited before becoming ready" >&2
+        exit 1
+    fi
+    sleep 0.1
+done
 
 # Open default browser to localhost
-xdg-open http://127.0.0.1:5001 2>/dev/null || open http://127.0.0.1:5001
+xdg-open "http://127.0.0.1:${PORT}" 2>/dev/null || open "http://127.0.0.1:${PORT}"
 
 # Wait for the Flask process to exit
-wait $APP_PID
\ No newline at end of file
+wait $APP_PID
@@ -1,5 +1,6 @@
 // Utility functions for UI state management
 let currentProcess = null;
+let currentJobId = null;
 let lastEODContext = null;
 let lastSprintReviewContext = null;
 
@@ -21,27 +22,79 @@ function showHistory() {
     loadHistory();
 }
 
-async function loadHistory() {
+const HISTORY_PAGE_SIZE = 50;
+let historyNextCursor = null;
+
+async function loadHistory(cursor = null) {
     try {
-        const response = await fetch('http://localhost:5001/history');
+        const params = new URLSearchParams({ limit: HISTORY_PAGE_SIZE, summary: '1' });
+        if (cursor) {
+            params.set('cursor', cursor);
+        }
+        const response = await fetch(`http://localhost:5001/history?${params}`);
         if (!response.ok) {
             throw new Error('Failed to load history');
         }
-        const entries = await response.json();
-        displayHistory(entries);
+        const page = await response.json();
+        historyNextCursor = page.next_cursor;
+        displayHistory(page.entries, Boolean(cursor));
     } catch (error) {
         showErrorModal('Failed to load history: ' + error.message);
     }
 }
 
-function displayHistory(entries) {
+function loadMoreHistory() {
+    if (historyNextCursor) {
+        loadHistory(historyNextCursor);
+    }
+}
+
+let historySearchTimer = null;
+
+// Debounce typing in the search box; an empty query goes back to the plain listing
+function onHistorySearchInput() {
+    clearTimeout(historySearchTimer);
+    historySearchTimer = setTimeout(() => {
+        const query = document.getElementById('historySearch').value.trim();
+        if (query) {
+            searchHistory(query);
+        } else {
+            loadHistory();
+        }
+    }, 250);
+}
+
+async function searchHistory(query) {
+    try {
+        const params = new URLSearchParams({ q: query, limit: HISTORY_PAGE_SIZE });
+        const response = await fetch(`http://localhost:5001/history/search?${params}`);
+        if (!response.ok) {
+            throw new Error('Failed to search history');
+        }
+        const page = await response.json();
+        historyNextCursor = null;
+        // Matches are shown as previews; the full response is fetched when expanded
+        displayHistory(page.results.map(result => ({ ...result, preview: result.snippet })));
+    } catch (error) {
+        showErrorModal('Failed to search history: ' + error.message);
+    }
+}
+
+function displayHistory(entries, append = false) {
     const historyList = document.getElementById('historyList');
     const template = document.getElementById('historyEntryTemplate');
-    historyList.innerHTML = '';
+    if (!append) {
+        historyList.innerHTML = '';
+    }
+    const loadMoreButton = document.getElementById('historyLoadMore');
+    if (loadMoreButton) {
+        loadMoreButton.remove();
+    }
 
     entries.forEach(entry => {
         const clone = template.content.cloneNode(true);
         const container = clone.querySelector('div');
+        container.setAttribute('data-entry-id', entry.id);
 
         // Set entry date
         const date = new Date(entry.date);
@@ -59,16 +112,19 @@ function displayHistory(entries) {
 
         // Set status with appropriate styling
         const statusSpan = container.querySelector('.entry-status');
-        statusSpan.textContent = entry.status;
+        statusSpan.textContent = entry.cached ? `${entry.status} (cached)` : entry.status;
         if (entry.status === 'passed') {
             statusSpan.classList.add('bg-green-900/20', 'text-green-400');
         } else {
             statusSpan.classList.add('bg-red-900/20', 'text-red-400');
         }
 
-        // Set response text
+        // Set response preview; the full response is fetched when expanded
         const responseElement = container.querySelector('.entry-response');
-        responseElement.textContent = entry.response;
+        responseElement.textContent = entry.response !== undefined ? entry.response : entry.preview;
+        if (entry.response !== undefined) {
+            responseElement.setAttribute('data-loaded', 'true');
+        }
         
         // Set delete button data
         const deleteButton = container.querySelector('button[onclick="deleteHistoryEntry(this)"]');
@@ -76,13 +132,37 @@ function displayHistory(entries) {
 
         historyList.appendChild(clone);
     });
+
+    if (historyNextCursor) {
+        const button = document.createElement('button');
+        button.id = 'historyLoadMore';
+        button.className = 'w-full p-4 text-primary-light hover:text-primary text-sm transition-colors';
+        button.textContent = 'Load More';
+        button.onclick = loadMoreHistory;
+        historyList.appendChild(button);
+    }
 }
 
-function toggleResponseVisibility(button) {
+async function toggleResponseVisibility(button) {
     const responseElement = button.previousElementSibling;
     const isCollapsed = responseElement.classList.contains('max-h-32');
     
     if (isCollapsed) {
+        if (!responseElement.hasAttribute('data-loaded')) {
+            const entryId = button.closest('[data-entry-id]').getAttribute('data-entry-id');
+            try {
+                const response = await fetch(`http://localhost:5001/history/${entryId}`);
+                if (!response.ok) {
+                    throw new Error('Failed to load entry');
+                }
+                const entry = await response.json();
+                responseElement.textContent = entry.response;
+                responseElement.setAttribute('data-loaded', 'true');
+            } catch (error) {
+                showErrorModal('Failed to load entry: ' + error.message);
+                return;
+            }
+        }
         responseElement.classList.remove('max-h-32');
         button.textContent = 'Show Less';
     } else {
@@ -358,10 +438,26 @@ function handleStream(response) {
             }
         });
 
+        // Show streamed tokens that have not been terminated by a newline yet
+        if (isCollectingResponse && buffer && !buffer.startsWith('RESPONSE')) {
+            updateResponse((accumulatedResponse + buffer).trim());
+        }
+
         return reader.read().then(processText);
     });
 }
 
+// Render a structured stage timing line such as STAGE {"stage": "collect_logs", "seconds": 0.41, ...}
+function formatStageLine(text) {
+    try {
+        const { pipeline, stage, seconds, ...details } = JSON.parse(text.slice('STAGE '.length));
+        const extra = Object.entries(details).map(([key, value]) => `${key}=${value}`).join(', ');
+        return `[${stage}] ${seconds.toFixed(2)}s` + (extra ? ` (${extra})` : '');
+    } catch (e) {
+        return text;
+    }
+}
+
 function handleStreamChunk(text) {
     if (text.includes('RESPONSE_START')) {
         isCollectingResponse = true;
@@ -381,6 +477,11 @@ function handleStreamChunk(text) {
         return;
     }
     
+    if (text.startsWith('STAGE ')) {
+        updateLogs(formatStageLine(text));
+        return;
+    }
+
     if (text.includes('Error:')) {
         updateLogs(text);
         if (!text.includes('Process cancelled')) {
@@ -391,6 +492,42 @@ function handleStreamChunk(text) {
     }
 }
 
+// Re-attach to a generation job that keeps running on the server after the connection dropped
+async function reattachJob(jobId) {
+    clearPanels();
+    updateLogs(`Re-attaching to job ${jobId}...\n`);
+    const controller = new AbortController();
+    currentProcess = controller;
+    const response = await fetch(`http://localhost:5001/jobs/${jobId}/stream`, {
+        signal: controller.signal
+    });
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    await handleStream(response);
+}
+
+async function runJobRequest(url, options) {
+    const controller = new AbortController();
+    currentProcess = controller;
+    currentJobId = null;
+
+    const response = await fetch(url, { ...options, signal: controller.signal });
+    if (!response.ok) {
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    currentJobId = response.headers.get('X-Job-Id');
+
+    try {
+        await handleStream(response);
+    } catch (error) {
+        if (error.name === 'AbortError' || !currentJobId) {
+            throw error;
+        }
+        await reattachJob(currentJobId);
+    }
+}
+
 // Main process handlers
 async function handleEOD(isRetry = false) {
     if (!isRetry) {
@@ -401,19 +538,7 @@ async function handleEOD(isRetry = false) {
     updateLogs('Starting EOD Generator...\n');
     
     try {
-        const controller = new AbortController();
-        currentProcess = controller;
-        
-        const response = await fetch('http://localhost:5001/run-eod', { 
-            method: 'POST',
-            signal: controller.signal
-        });
-        
-        if (!response.ok) {
-            throw new Error(`HTTP error! status: ${response.status}`);
-        }
-        
-        await handleStream(response);
+        await runJobRequest('http://localhost:5001/run-eod', { method: 'POST' });
     } catch (error) {
         if (error.name === 'AbortError') {
             handleError(error);
@@ -455,10 +580,7 @@ async function handleSprintReviewSubmit(context = null) {
     updateLogs('Starting Sprint Review Generator...\n');
     
     try {
-        const controller = new AbortController();
-        currentProcess = controller;
-        
-        const response = await fetch('http://localhost:5001/run-sprint-review', {
+        await runJobRequest('http://localhost:5001/run-sprint-review', {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({ 
@@ -476,15 +598,8 @@ async function handleSprintReviewSubmit(context = null) {
                         number: ticket.split('-')[1]
                     }))
                 }
-            }),
-            signal: controller.signal
+            })
         });
-        
-        if (!response.ok) {
-            throw new Error(`HTTP error! status: ${response.status}`);
-        }
-        
-        await handleStream(response);
     } catch (error) {
         if (error.name === 'AbortError') {
             handleError(error);
@@ -0,0 +1,284 @@
+"""
+Static asset pipeline.
+
+`python -m web_components.assets` builds static/dist once: the background
+image resized to a few widths as WebP/AVIF (Pillow), script.js and index.html
+precompressed with gzip and brotli, and every asset except index.html renamed
+with a content hash so it can be cached forever. At runtime AssetStore keeps
+the built files in memory. Without a build it compiles the same assets in
+memory at first use, minus the image variants. Pillow and brotli come from
+requirements.txt; without them the build skips the image variants or the .br
+files.
+"""
+import gzip
+import hashlib
+import io
+import json
+import logging
+import mimetypes
+import os
+import sys
+import threading
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+BUILD_DIR = "dist"
+MANIFEST_FILE = "manifest.json"
+
+# URL prefix of content-hashed assets; they never change and are cached for a year
+ASSET_PREFIX = "/assets/"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# index.html keeps its name, so browsers revalidate it with its ETag
+INDEX_CACHE_CONTROL = "no-cache"
+
+# Source files referenced from index.html, by the URL they are referenced with
+HASHED_SOURCES = {
+    "/script.js": "script.js",
+    "/images/background.png": "images/background.png",
+}
+BACKGROUND_URL = "/images/background.png"
+BACKGROUND_SELECTOR = ".bg-image"
+IMAGE_WIDTHS = (768, 1280, 1920)
+IMAGE_FORMATS = (("avif", "AVIF", {"quality": 50}), ("webp", "WEBP", {"quality": 80, "method": 6}))
+
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml")
+
+
+class Asset:
+    """One servable file with its precompressed bodies"""
+    __slots__ = ("name", "content_type", "body", "gzip", "brotli", "etag")
+
+    def __init__(
+        self,
+        name: str,
+        content_type: str,
+        body: bytes,
+        gzip_body: Optional[bytes] = None,
+        brotli_body: Optional[bytes] = None
+    ):
+        self.name = name
+        self.content_type = content_type
+        self.body = body
+        self.gzip = gzip_body
+        self.brotli = brotli_body
+        self.etag = f'"{content_hash(body, 20)}"'
+
+
+def content_hash(data: bytes, length: int = 10) -> str:
+    return hashlib.sha256(data).hexdigest()[:length]
+
+
+def hashed_name(path: str, data: bytes) -> str:
+    """images/background.png -> background.<hash>.png"""
+    stem, extension = os.path.splitext(os.path.basename(path))
+    return f"{stem}.{content_hash(data)}{extension}"
+
+
+def guess_type(name: str) -> str:
+    content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    if content_type.startswith("text/") or content_type == "application/javascript":
+        content_type += "; charset=utf-8"
+    return content_type
+
+
+def compress(name: str, body: bytes) -> Tuple[Optional[bytes], Optional[bytes]]:
+    """gzip and brotli bodies for text assets; images are already compressed"""
+    if not guess_type(name).startswith(COMPRESSIBLE_TYPES):
+        return None, None
+    gzip_body = gzip.compress(body, compresslevel=9, mtime=0)
+    brotli_body = brotli.compress(body, quality=11) if brotli else None
+    return gzip_body, brotli_body
+
+
+def image_variants(data: bytes) -> List[Tuple[int, str, bytes]]:
+    """
+    Resize the image to IMAGE_WIDTHS (never upscaling) and encode each width
+    in every format Pillow supports. Returns (width, extension, bytes), largest first.
+    """
+    try:
+        from PIL import Image, features
+    except ImportError:
+        logging.warning("Pillow is not installed, skipping WebP/AVIF image variants")
+        return []
+
+    variants = []
+    with Image.open(io.BytesIO(data)) as image:
+        image.load()
+        widths = sorted({min(width, image.width) for width in IMAGE_WIDTHS}, reverse=True)
+        for width in widths:
+            height = round(image.height * width / image.width)
+            resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+            for extension, pillow_format, options in IMAGE_FORMATS:
+                if not features.check(extension):
+                    continue
+                output = io.BytesIO()
+                resized.save(output, format=pillow_format, **options)
+                variants.append((width, extension, output.getvalue()))
+    return variants
+
+
+def background_css(urls_by_width: Dict[int, Dict[str, str]], fallback_url: str) -> Tuple[str, str]:
+    """
+    CSS for the background: the declaration replacing the original url() in the
+    BACKGROUND_SELECTOR rule, and media-query overrides for narrower screens.
+    """
+    def image_set(urls: Dict[str, str]) -> str:
+        candidates = [f"url('{url}') type('image/{extension}')" for extension, url in urls.items()]
+        return f"image-set({', '.join(candidates)})"
+
+    widths = sorted(urls_by_width, reverse=True)
+    declaration = f"background-image: url('{fallback_url}');"
+    if not widths:
+        return declaration, ""
+    declaration += f"\n            background-image: {image_set(urls_by_width[widths[0]])};"
+    overrides = "".join(
+        f"\n        @media (max-width: {width}px) {{ {BACKGROUND_SELECTOR} {{ background-image: "
+        f"{image_set(urls_by_width[width])}; }} }}"
+        for width in widths[1:]
+    )
+    return declaration, overrides
+
+
+def compile_assets(static_dir: str, variants: bool = True) -> Tuple[Asset, Dict[str, Asset]]:
+    """
+    Build index.html and the hashed assets it references in memory.
+    Returns the index asset and the hashed assets keyed by file name.
+    """
+    assets: Dict[str, Asset] = {}
+    urls: Dict[str, str] = {}
+
+    def add(name: str, body: bytes) -> str:
+        assets[name] = Asset(name, guess_type(name), body, *compress(name, body))
+        return f"{ASSET_PREFIX}{name}"
+
+    for url, path in HASHED_SOURCES.items():
+        with open(os.path.join(static_dir, path), "rb") as f:
+            data = f.read()
+        urls[url] = add(hashed_name(path, data), data)
+        if url == BACKGROUND_URL:
+            background_path, background_data = path, data
+
+    urls_by_width: Dict[int, Dict[str, str]] = {}
+    if variants:
+        stem, extension = os.path.splitext(os.path.basename(background_path))
+        for width, variant_extension, body in image_variants(background_data):
+            name = hashed_name(f"{stem}-{width}.{variant_extension}", body)
+            urls_by_width.setdefault(width, {})[variant_extension] = add(name, body)
+        # The original stays the last image-set candidate for browsers without WebP/AVIF
+        for width_urls in urls_by_width.values():
+            width_urls[extension.lstrip(".")] = urls[BACKGROUND_URL]
+    declaration, overrides = background_css(urls_by_width, urls[BACKGROUND_URL])
+
+    with open(os.path.join(static_dir, "index.html"), "r", encoding="utf-8") as f:
+        html = f.read()
+    html = html.replace(f"background-image: url('{BACKGROUND_URL}');", declaration, 1)
+    if overrides:
+        html = html.replace("</style>", f"{overrides}\n    </style>", 1)
+    for url, hashed_url in urls.items():
+        html = html.replace(f'"{url}"', f'"{hashed_url}"').replace(f"'{url}'", f"'{hashed_url}'")
+    body = html.encode("utf-8")
+    index = Asset("index.html", guess_type("index.html"), body, *compress("index.html", body))
+    return index, assets
+
+
+def source_hashes(static_dir: str) -> Dict[str, str]:
+    """Hashes of the source files a build was made from, to detect a stale build"""
+    hashes = {}
+    for path in ["index.html", *HASHED_SOURCES.values()]:
+        with open(os.path.join(static_dir, path), "rb") as f:
+            hashes[path] = content_hash(f.read())
+    return hashes
+
+
+def build_assets(static_dir: str = "static") -> str:
+    """Write compiled assets, their .gz/.br files and a manifest to static_dir/dist"""
+    if brotli is None:
+        logging.warning("brotli is not installed, skipping .br files")
+    output_dir = os.path.join(static_dir, BUILD_DIR)
+    os.makedirs(output_dir, exist_ok=True)
+    index, assets = compile_assets(static_dir, variants=True)
+    manifest = {"sources": source_hashes(static_dir), "assets": {}}
+    for asset in [index, *assets.values()]:
+        files = {"body": asset.name}
+        with open(os.path.join(output_dir, asset.name), "wb") as f:
+            f.write(asset.body)
+        for suffix, body in ((".gz", asset.gzip), (".br", asset.brotli)):
+            if body is not None:
+                with open(os.path.join(output_dir, asset.name + suffix), "wb") as f:
+                    f.write(body)
+                files[suffix.lstrip(".")] = asset.name + suffix
+        manifest["assets"][asset.name] = files
+    with open(os.path.join(output_dir, MANIFEST_FILE), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    total = sum(len(asset.body) for asset in assets.values())
+    logging.info(f"Built {len(manifest['assets'])} assets ({total} bytes before compression) in {output_dir}")
+    return output_dir
+
+
+class AssetStore:
+    """
+    Serves the built assets from memory. Loaded on first use; when static/dist
+    has not been built, or was built from different sources, the assets are
+    compiled in memory without image variants.
+    """
+
+    def __init__(self, static_dir: str = "static"):
+        self.static_dir = static_dir
+        self._index: Optional[Asset] = None
+        self._assets: Dict[str, Asset] = {}
+        self._lock = threading.Lock()
+
+    def _load(self) -> None:
+        with self._lock:
+            if self._index is not None:
+                return
+            output_dir = os.path.join(self.static_dir, BUILD_DIR)
+            manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+            manifest = None
+            if os.path.exists(manifest_path):
+                with open(manifest_path) as f:
+                    manifest = json.load(f)
+                if manifest.get("sources") != source_hashes(self.static_dir):
+                    logging.warning(
+                        f"Assets in {output_dir} are out of date, rebuild them with `python -m web_components.assets`"
+                    )
+                    manifest = None
+            if manifest:
+                assets = {}
+                for name, files in manifest["assets"].items():
+                    bodies = {}
+                    for key, file_name in files.items():
+                        with open(os.path.join(output_dir, file_name), "rb") as f:
+                            bodies[key] = f.read()
+                    assets[name] = Asset(
+                        name, guess_type(name), bodies["body"], bodies.get("gz"), bodies.get("br")
+                    )
+                index = assets.pop("index.html")
+                logging.info(f"Loaded {len(assets) + 1} built assets from {output_dir}")
+            else:
+                index, assets = compile_assets(self.static_dir, variants=False)
+                logging.info(
+                    f"Compiled {len(assets) + 1} assets in memory; "
+                    "run `python -m web_components.assets` to add image variants"
+                )
+            self._assets = assets
+            self._index = index
+
+    def index(self) -> Asset:
+        if self._index is None:
+            self._load()
+        return self._index
+
+    def get(self, name: str) -> Optional[Asset]:
+        if self._index is None:
+            self._load()
+        return self._assets.get(name)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    build_assets(sys.argv[1] if len(sys.argv) > 1 else "static")
@@ -0,0 +1,103 @@
+import gzip
+import hashlib
+import json
+from typing import Any, Optional
+from flask import Response, request
+
+# Responses smaller than this are not worth compressing
+GZIP_MIN_SIZE = 1024
+
+# Content-Encodings an ETag can carry as a suffix; None is the identity body
+ETAG_ENCODINGS = (None, "gzip", "br")
+
+
+def client_accepts_gzip() -> bool:
+    return "gzip" in request.headers.get("Accept-Encoding", "").lower()
+
+
+def client_accepts_brotli() -> bool:
+    return "br" in [
+        encoding.split(";")[0].strip() for encoding in request.headers.get("Accept-Encoding", "").lower().split(",")
+    ]
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a strong ETag from the parts that determine a response"""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:20]}"'
+
+
+def encoded_etag(etag: str, encoding: Optional[str]) -> str:
+    """
+    The ETag of a compressed body: a strong ETag names byte-identical bodies,
+    so each Content-Encoding gets its own suffix ("...-gzip", "...-br").
+    """
+    return f'{etag[:-1]}-{encoding}"' if encoding else etag
+
+
+def requested_etag(etag: str) -> Optional[str]:
+    """The If-None-Match entry naming etag in any encoding, if the request has one"""
+    header = request.headers.get("If-None-Match", "")
+    if header.strip() == "*":
+        return etag
+    for tag in header.split(","):
+        tag = tag.strip().removeprefix("W/")
+        if tag in [encoded_etag(etag, encoding) for encoding in ETAG_ENCODINGS]:
+            return tag
+    return None
+
+
+def etag_matches(etag: str) -> bool:
+    """Whether the request's If-None-Match header already names etag, in any encoding"""
+    return requested_etag(etag) is not None
+
+
+def json_response(payload: Any, status: int = 200, etag: Optional[str] = None) -> Response:
+    """
+    Serialize payload as JSON, answering 304 when the client already has etag
+    and gzip-compressing large bodies for clients that accept it.
+    """
+    cached_etag = requested_etag(etag) if etag else None
+    if cached_etag:
+        response = Response(status=304)
+        response.headers["ETag"] = cached_etag
+        return response
+
+    body = json.dumps(payload).encode("utf-8")
+    response = Response(body, status=status, mimetype="application/json")
+    encoding = None
+    if len(body) >= GZIP_MIN_SIZE and client_accepts_gzip():
+        response.set_data(gzip.compress(body, compresslevel=6))
+        encoding = response.headers["Content-Encoding"] = "gzip"
+    response.headers["Vary"] = "Accept-Encoding"
+    if etag:
+        response.headers["ETag"] = encoded_etag(etag, encoding)
+        response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def asset_response(asset, cache_control: str) -> Response:
+    """
+    Serve an in-memory asset (see web_components.assets), answering 304 for a
+    matching ETag and choosing its precompressed brotli or gzip body when accepted.
+    """
+    cached_etag = requested_etag(asset.etag)
+    if cached_etag:
+        response = Response(status=304)
+        etag = cached_etag
+    elif asset.brotli is not None and client_accepts_brotli():
+        response = Response(asset.brotli, content_type=asset.content_type)
+        response.headers["Content-Encoding"] = "br"
+        etag = encoded_etag(asset.etag, "br")
+    elif asset.gzip is not None and client_accepts_gzip():
+        response = Response(asset.gzip, content_type=asset.content_type)
+        response.headers["Content-Encoding"] = "gzip"
+        etag = encoded_etag(asset.etag, "gzip")
+    else:
+        response = Response(asset.body, content_type=asset.content_type)
+        etag = asset.etag
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    if asset.gzip is not None:
+        response.headers["Vary"] = "Accept-Encoding"
+    return response
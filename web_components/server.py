@@ -0,0 +1,71 @@
+import logging
+from typing import Dict
+from environment.constants import (
+    server_channel_timeout,
+    server_connection_limit,
+    server_host,
+    server_port,
+    server_threads,
+)
+
+
+class AppServer:
+    """
+    Serves app with waitress, a multi-threaded production WSGI server.
+
+    Every server-sent event stream occupies one worker thread while it is
+    open, so SERVER_THREADS should exceed the number of concurrent streams
+    expected alongside ordinary requests. Responses are written as soon as
+    they are produced, which keeps token streaming responsive.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        # Every socket of the server; owned here so stop() can close them all
+        self._socket_map: Dict = {}
+        self._server = None
+
+    def run(self) -> None:
+        """Serve until stop() is called"""
+        try:
+            from waitress.server import create_server
+        except ImportError:
+            logging.warning("waitress is not installed, falling back to the threaded Flask server")
+            self.app.run(host=server_host, port=server_port, debug=False, threaded=True, use_reloader=False)
+            return
+
+        logging.info(
+            f"Serving on http://{server_host}:{server_port} with {server_threads} threads "
+            f"and up to {server_connection_limit} connections"
+        )
+        self._server = create_server(
+            self.app,
+            map=self._socket_map,
+            host=server_host,
+            port=server_port,
+            threads=server_threads,
+            connection_limit=server_connection_limit,
+            channel_timeout=server_channel_timeout,
+            ident="eod-generator"
+        )
+        self._server.run()
+        self._server.task_dispatcher.shutdown()
+
+    def stop(self) -> bool:
+        """
+        Close the listening sockets and open connections so run() returns; safe
+        to call from any thread, since the sockets are closed inside the server's
+        event loop. Returns False when the server cannot be stopped this way
+        (not started yet, or the Flask fallback).
+        """
+        if self._server is None:
+            return False
+        from waitress import wasyncore
+        from waitress.server import BaseWSGIServer
+
+        # One per listening socket; a pulled trigger runs its callback in the event loop
+        servers = [channel for channel in list(self._socket_map.values()) if isinstance(channel, BaseWSGIServer)]
+        if not servers:
+            return False
+        servers[0].trigger.pull_trigger(lambda: wasyncore.close_all(self._socket_map))
+        return True